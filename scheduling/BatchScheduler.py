@@ -0,0 +1,739 @@
+from math import inf, nan, sqrt
+from random import Random
+from statistics import mean, stdev
+
+import numpy
+
+from .Scheduler import SchedulerStats
+from .Server import Server
+
+
+class BatchScheduler:
+    """A lockstep simulation of many independent experiments.
+
+    Each experiment, or lane, has its own configuration, workload and random
+    number generator. The lanes advance together from one event to the next,
+    each to its own next instant, and the decisions of Scheduler.update_schedule
+    are applied as array operations across the lanes: retiring the complete
+    jobs, starting the queued requests in FIFO order, reconfiguring the running
+    jobs and powering off the idle servers.
+
+    The state of a lane is held in arrays: the jobs occupy slots, whose servers
+    are a mask over the servers of the lane. The decisions that depend on the
+    random module draw from the generator of the lane, in the same order as the
+    Scheduler, and the statistics are accumulated in the same order, so a lane
+    yields exactly the statistics of the Scheduler on the same inputs.
+    """
+
+    NORMAL = 0  #: The kind of the jobs computing the mass of a request.
+    RECONFIGURATION = 1  #: The kind of the jobs transferring data.
+    POWER_OFF = 2  #: The kind of the jobs powering off a server.
+    MIN_LANES = 40
+    """The count of lanes from which the lockstep simulation of 50 jobs is faster
+    than the Scheduler running them one by one, measured on 5 to 20 servers."""
+
+    def __init__(
+        self,
+        server_count: int,
+        configs: list,
+        workloads: list,
+        rng_states: list,
+        reconfig_enabled=True,
+        power_off_enabled=True,
+        param_enabled=True,
+        keep_segments=True,
+    ):
+        """Creates a BatchScheduler object.
+
+        Args:
+            server_count: The total number of servers of each lane.
+            configs: The SchedulerConfig of each lane.
+            workloads: The Workload of each lane.
+            rng_states: The state of the random module from which each lane \
+            starts, as returned by random.getstate.
+            reconfig_enabled: A flag for enabling reconfigurations.
+            power_off_enabled: A flag for enabling power-offs.
+            param_enabled: A flag for enabling the decision taking process, if \
+            False the lanes always reconfigure jobs, respectively shut down idle \
+            servers.
+            keep_segments: A flag for computing the stretch time statistics as \
+            the Scheduler recording its segments does, from all the requests at \
+            the end. If False, they are folded as the requests complete.
+        """
+        lane_count = len(configs)
+        self.server_count = server_count  #: The total number of servers of a lane.
+        self.configs = list(configs)  #: The SchedulerConfig of each lane.
+        self.reconfig_enabled = reconfig_enabled
+        """A flag for enabling reconfigurations."""
+        self.power_off_enabled = power_off_enabled  #: A flag for enabling power-offs.
+        self.param_enabled = param_enabled
+        """A flag for enabling the decision taking process."""
+        self.keep_segments = keep_segments
+        """A flag for computing the stretch times from all the requests at the end."""
+        self.rngs = []
+        """list: The random.Random generator of each lane."""
+        for state in rng_states:
+            rng = Random()
+            rng.setstate(state)
+            self.rngs.append(rng)
+
+        # The requests, one row per lane, padded with requests never submitted.
+        self.request_count = numpy.array([len(w) for w in workloads], dtype=int)
+        """numpy.array: The count of requests of each lane."""
+        width = max(self.request_count.max(initial=0), 1)
+        self.sub_time = self._pad(workloads, "sub_time", width, inf)
+        """numpy.array: The submission times of the requests, by lane."""
+        self.alpha = self._pad(workloads, "alpha", width, 0.0)
+        """numpy.array: The speedup factors of the requests, by lane."""
+        self.data = self._pad(workloads, "data", width, 0.0)
+        """numpy.array: The amounts of data of the requests, by lane."""
+        self.mass = self._pad(workloads, "mass", width, 0.0)
+        """numpy.array: The masses of the requests, by lane."""
+        self.min_num_servers = self._pad(workloads, "min_num_servers", width, 0)
+        """numpy.array: The minimum numbers of servers of the requests, by lane."""
+        self.max_num_servers = self._pad(workloads, "max_num_servers", width, 0)
+        """numpy.array: The maximum numbers of servers of the requests, by lane."""
+        self._min_servers_sums = numpy.zeros((lane_count, width + 1), dtype=int)
+        numpy.cumsum(self.min_num_servers, axis=1, out=self._min_servers_sums[:, 1:])
+        self._reconfig_scales = numpy.array(
+            [config.reconfig_scale for config in configs], dtype=float
+        )
+        self._reconfig_weights = numpy.array(
+            [config.reconfig_weight for config in configs], dtype=float
+        )
+        # The factors of the decisions, computed by Python as in the Scheduler.
+        self._alpha_factors = numpy.array(
+            [
+                [alpha**config.alpha_weight for alpha in alphas]
+                for config, alphas in zip(configs, self.alpha.tolist())
+            ]
+        ).reshape(lane_count, width)
+        self._shutdown_factors = numpy.array(
+            [
+                [
+                    ((count / server_count) ** config.shutdown_weight)
+                    * config.shutdown_scale
+                    for count in range(server_count + 1)
+                ]
+                for config in configs
+            ]
+        ).reshape(lane_count, server_count + 1)
+
+        # The progress of the lanes through their requests.
+        self.next_request = numpy.zeros(lane_count, dtype=int)
+        """numpy.array: The index of the next request to be submitted, by lane."""
+        self.queue_head = numpy.zeros(lane_count, dtype=int)
+        """numpy.array: The index of the earliest queued request, by lane. The \
+        queue of a lane holds the requests from queue_head to next_request."""
+        self.time = numpy.zeros(lane_count)
+        """numpy.array: The instant of the last processed event, by lane."""
+        self.done = numpy.zeros(lane_count, dtype=bool)
+        """numpy.array: A mask of the stopped lanes."""
+
+        # The running jobs, in slots.
+        slot_count = 2 * server_count + 2
+        self.active = numpy.zeros((lane_count, slot_count), dtype=bool)
+        """numpy.array: A mask of the slots holding a running job, by lane."""
+        self.kind = numpy.zeros((lane_count, slot_count), dtype=int)
+        """numpy.array: The kind of the job of each slot, by lane."""
+        self.request = numpy.zeros((lane_count, slot_count), dtype=int)
+        """numpy.array: The request index of the job of each slot, by lane."""
+        self.job_alpha = numpy.zeros((lane_count, slot_count))
+        """numpy.array: The speedup factor of the job of each slot, by lane."""
+        self.job_data = numpy.zeros((lane_count, slot_count))
+        """numpy.array: The amount of data of the job of each slot, by lane."""
+        self.job_mass = numpy.zeros((lane_count, slot_count))
+        """numpy.array: The mass of the job of each slot, by lane."""
+        self.job_max_servers = numpy.zeros((lane_count, slot_count), dtype=int)
+        """numpy.array: The maximum number of servers of each job, by lane."""
+        self.job_server_count = numpy.zeros((lane_count, slot_count), dtype=int)
+        """numpy.array: The number of servers of the job of each slot, by lane."""
+        self.speed = numpy.zeros((lane_count, slot_count))
+        """numpy.array: The mass computed per unit of time by each job, by lane."""
+        self.start = numpy.zeros((lane_count, slot_count))
+        """numpy.array: The starting time of the job of each slot, by lane."""
+        self.end = numpy.zeros((lane_count, slot_count))
+        """numpy.array: The ending time of the job of each slot, by lane."""
+        self.start_order = numpy.zeros((lane_count, slot_count), dtype=int)
+        """numpy.array: The starting order of the job of each slot, by lane."""
+        self.servers = numpy.zeros((lane_count, slot_count, server_count), dtype=bool)
+        """numpy.array: The servers of the job of each slot, by lane."""
+        self._start_counter = numpy.zeros(lane_count, dtype=int)
+        self.server_job_counts = numpy.zeros((lane_count, server_count), dtype=int)
+        """numpy.array: The count of running jobs of each server, by lane."""
+        self.working_count = numpy.zeros(lane_count, dtype=int)
+        """numpy.array: The count of running jobs but power-offs, by lane."""
+
+        # The statistics, accumulated as in a StatsAccumulator.
+        self.energy = numpy.zeros(lane_count)
+        """numpy.array: The energy consumed by the jobs, by lane."""
+        self.area = numpy.zeros(lane_count)
+        """numpy.array: The sum of the durations of the jobs times their servers."""
+        self.reconfig_count = numpy.zeros(lane_count, dtype=int)
+        """numpy.array: The count of completed reconfigurations, by lane."""
+        self.power_off_count = numpy.zeros(lane_count, dtype=int)
+        """numpy.array: The count of completed power-offs, by lane."""
+        self.start_time = numpy.full(lane_count, inf)
+        """numpy.array: The earliest starting time of a completed job, by lane."""
+        self.end_time = numpy.full(lane_count, -inf)
+        """numpy.array: The latest ending time of a completed job, by lane."""
+        self.last_end_times = numpy.full((lane_count, width), nan)
+        """numpy.array: The ending time of the last completed job of each request."""
+        self._retired = numpy.zeros((lane_count, width), dtype=bool)
+        self._retired_stretch_times = numpy.zeros((lane_count, width))
+        self._retired_count = numpy.zeros(lane_count, dtype=int)
+
+    def __len__(self):
+        return len(self.configs)
+
+    def run(self):
+        """Simulates all the lanes until they stop working.
+
+        Returns:
+            list: The SchedulerStats of each lane, with weights of 1 and without \
+            completed jobs nor segments.
+        """
+        while True:
+            self._stop_idle_lanes()
+            lanes = numpy.flatnonzero(~self.done)
+            if not len(lanes):
+                break
+            next_end = numpy.where(self.active[lanes], self.end[lanes], inf).min(1)
+            pending = self.next_request[lanes] < self.request_count[lanes]
+            arrival = numpy.full(len(lanes), inf)
+            arrival[pending] = self.sub_time[
+                lanes[pending], self.next_request[lanes[pending]]
+            ]
+            time = numpy.minimum(next_end, arrival)
+            # Nothing can change the schedule of a lane without events anymore.
+            stuck = time == inf
+            if stuck.any():
+                self._stop(lanes[stuck])
+                lanes, time, arrival = lanes[~stuck], time[~stuck], arrival[~stuck]
+            self.time[lanes] = time
+            self.next_request[lanes[arrival == time]] += 1
+            self._update_schedule(lanes, time)
+        return [self._stats(lane) for lane in range(len(self))]
+
+    def _update_schedule(self, lanes, time):
+        # The phases of Scheduler.update_schedule, applied to the lanes.
+        self._complete_jobs(lanes, time)
+        self._schedule_jobs(lanes, time)
+        if self.reconfig_enabled:
+            self._reconfigure_jobs(lanes, time)
+        if self.power_off_enabled:
+            self._power_off_servers(lanes, time)
+
+    def _stop_idle_lanes(self):
+        # Stops the lanes with no request to come, queued or running.
+        idle = (
+            ~self.done
+            & (self.next_request >= self.request_count)
+            & (self.queue_head >= self.next_request)
+            & (self.working_count == 0)
+        )
+        if idle.any():
+            self._stop(numpy.flatnonzero(idle))
+
+    def _stop(self, lanes):
+        # Ends the running jobs, i.e. the power-offs, at the last event instant.
+        active = self.active[lanes]
+        self.end[lanes] = numpy.where(active, self.time[lanes, None], self.end[lanes])
+        self._remove_in_order(lanes, active)
+        if not self.keep_segments:
+            # The requests ended by interruption are retired in arrival order.
+            requests = numpy.arange(self.last_end_times.shape[1])
+            pending = (
+                (requests < self.next_request[lanes, None])
+                & ~numpy.isnan(self.last_end_times[lanes])
+                & ~self._retired[lanes]
+            )
+            self._retire(lanes, numpy.broadcast_to(requests, pending.shape), pending)
+        self.done[lanes] = True
+
+    def _complete_jobs(self, lanes, time):
+        # Removes the jobs complete at time, in starting order.
+        complete = self.active[lanes] & (self.end[lanes] <= time[:, None])
+        lanes, slots, removed = self._remove_in_order(lanes, complete)
+        if not self.keep_segments and len(lanes):
+            # A job completing without interruption is the last one of its request.
+            rows = lanes[:, None]
+            self._retire(
+                lanes,
+                self.request[rows, slots],
+                removed & (self.job_mass[rows, slots] > 0),
+            )
+
+    def _schedule_jobs(self, lanes, time):
+        # Starts the queued requests in FIFO order while the servers suffice.
+        while len(lanes):
+            free_count = (self.server_job_counts[lanes] == 0).sum(1)
+            head = self.queue_head[lanes]
+            ready = (head < self.next_request[lanes]) & (free_count > 0)
+            lanes, time, head, free_count = (
+                lanes[ready],
+                time[ready],
+                head[ready],
+                free_count[ready],
+            )
+            server_count = numpy.minimum(self.max_num_servers[lanes, head], free_count)
+            ready = (server_count >= self.min_num_servers[lanes, head]) & (
+                server_count > 0
+            )
+            lanes, time, head, server_count = (
+                lanes[ready],
+                time[ready],
+                head[ready],
+                server_count[ready],
+            )
+            if not len(lanes):
+                break
+
+            servers = self._sample_free_servers(lanes, server_count)
+            alpha = self.alpha[lanes, head]
+            mass = self.mass[lanes, head]
+            speed = self._power(server_count, alpha)
+            self._start(
+                lanes,
+                self.NORMAL,
+                head,
+                alpha,
+                self.data[lanes, head],
+                mass,
+                self.max_num_servers[lanes, head],
+                servers,
+                time,
+                time + mass / speed,
+                speed,
+            )
+            self.queue_head[lanes] += 1
+
+    def _reconfigure_jobs(self, lanes, time):
+        # Reconfigures the running jobs, smallest remaining mass first, while
+        # servers are available.
+        available = (self.server_job_counts[lanes] == 0).any(1)
+        lanes, time = lanes[available], time[available]
+        if not len(lanes):
+            return
+        server_count = self.job_server_count[lanes]
+        candidates = (
+            self.active[lanes]
+            & (self.job_mass[lanes] != 0)
+            & (server_count != self.job_max_servers[lanes])
+        )
+        reconfigurable = candidates.any(1)
+        if not reconfigurable.all():
+            lanes, time = lanes[reconfigurable], time[reconfigurable]
+            candidates = candidates[reconfigurable]
+            if not len(lanes):
+                return
+        start = self.start[lanes]
+        executed = (
+            numpy.minimum(numpy.maximum(time[:, None], start), self.end[lanes]) - start
+        ) * self.speed[lanes]
+        remaining = numpy.where(candidates, self.job_mass[lanes] - executed, inf)
+        ranked = numpy.lexsort((self.start_order[lanes], remaining), axis=1)
+        candidate_count = candidates.sum(1)
+
+        for rank in range(candidate_count.max(initial=0)):
+            free_count = (self.server_job_counts[lanes] == 0).sum(1)
+            selected = (candidate_count > rank) & (free_count > 0)
+            round_lanes = lanes[selected]
+            if not len(round_lanes):
+                break
+            slots = ranked[selected, rank]
+            round_time = time[selected]
+            free_count = free_count[selected]
+            count = self.job_server_count[round_lanes, slots]
+            max_count = self.job_max_servers[round_lanes, slots]
+            extra_count = numpy.minimum(max_count - count, free_count)
+            if self.param_enabled:
+                scale = self._reconfig_scales[round_lanes]
+                weight = self._reconfig_weights[round_lanes]
+                factor = self._alpha_factors[
+                    round_lanes, self.request[round_lanes, slots]
+                ]
+                accepted = (
+                    0.5
+                    < (self._power((count + extra_count) / max_count, weight) * factor)
+                    * scale
+                )
+            else:
+                accepted = extra_count > 0
+            if accepted.any():
+                self._reconfigure(
+                    round_lanes[accepted],
+                    slots[accepted],
+                    extra_count[accepted],
+                    round_time[accepted],
+                )
+
+    def _reconfigure(self, lanes, slots, extra_count, time):
+        # Splits jobs into a reconfiguration and the rest of their computations,
+        # running on their servers and extra ones.
+        extra_servers = self._sample_free_servers(lanes, extra_count)
+        self.end[lanes, slots] = time
+        count = self.job_server_count[lanes, slots]
+        new_count = count + extra_count
+        reconfig_time = (
+            self.job_data[lanes, slots] / new_count * numpy.floor(new_count / count)
+        )
+        alpha = self.job_alpha[lanes, slots]
+        rest_mass = (
+            self.job_mass[lanes, slots]
+            - (time - self.start[lanes, slots]) * self.speed[lanes, slots]
+        )
+        request = self.request[lanes, slots]
+        data = self.job_data[lanes, slots]
+        max_count = self.job_max_servers[lanes, slots]
+        servers = self.servers[lanes, slots] | extra_servers
+        self._remove(lanes, slots)
+
+        zeros = numpy.zeros(len(lanes))
+        self._start(
+            lanes,
+            self.RECONFIGURATION,
+            request,
+            zeros,
+            zeros,
+            zeros,
+            numpy.zeros(len(lanes), dtype=int),
+            servers,
+            time,
+            time + reconfig_time,
+            zeros,
+        )
+        rest_start = time + reconfig_time
+        speed = self._power(new_count, alpha)
+        self._start(
+            lanes,
+            self.NORMAL,
+            request,
+            alpha,
+            data,
+            rest_mass,
+            max_count,
+            servers,
+            rest_start,
+            rest_start + rest_mass / speed,
+            speed,
+        )
+
+    def _power_off_servers(self, lanes, time):
+        # Powers off the available servers in index order while the queue and
+        # the decision process allow it.
+        free = self.server_job_counts[lanes] == 0
+        available = free.any(1)
+        if not available.all():
+            lanes, time, free = lanes[available], time[available], free[available]
+            if not len(lanes):
+                return
+        free_count = free.sum(1)
+        # The count of available servers of each lane before each power-off, the
+        # queue being unchanged by the power-offs.
+        count = free_count[:, None] - numpy.arange(free_count.max())
+        queued = self.queue_head[lanes] < self.next_request[lanes]
+        queue_min = (
+            self._min_servers_sums[lanes, self.next_request[lanes]]
+            - self._min_servers_sums[lanes, self.queue_head[lanes]]
+        )
+        allowed = (count > 0) & (~queued[:, None] | (count > queue_min[:, None]))
+        if self.param_enabled:
+            allowed &= ~(
+                0.5 > self._shutdown_factors[lanes[:, None], numpy.maximum(count, 0)]
+            )
+        # A lane stops powering off servers at its first refusal.
+        allowed = numpy.logical_and.accumulate(allowed, axis=1)
+        if not allowed.any():
+            return
+
+        # The power-offs of a lane are started consecutively, in index order of
+        # their servers, the available ones being sorted first.
+        rows, ranks = numpy.nonzero(allowed)
+        power_off_lanes = lanes[rows]
+        duration = numpy.array(
+            [self._shutdown_duration(lane) for lane in power_off_lanes.tolist()]
+        )
+        servers = numpy.zeros((len(rows), self.server_count), dtype=bool)
+        free_servers = numpy.argsort(~free, axis=1, kind="stable")
+        servers[numpy.arange(len(rows)), free_servers[rows, ranks]] = True
+        zeros = numpy.zeros(len(rows))
+        self._start(
+            power_off_lanes,
+            self.POWER_OFF,
+            numpy.full(len(rows), -1),
+            zeros,
+            zeros,
+            zeros,
+            numpy.zeros(len(rows), dtype=int),
+            servers,
+            time[rows],
+            time[rows] + duration,
+            zeros,
+        )
+
+    def _shutdown_duration(self, lane: int):
+        # The duration of a power-off, drawn as in Scheduler._allow_shutdown.
+        config = self.configs[lane]
+        if self.param_enabled and self.rngs[lane].random() >= config.shutdown_time_prob:
+            return config.shutdown_time_long
+        return config.shutdown_time_short
+
+    def _sample_free_servers(self, lanes, counts):
+        # Draws servers among the free ones of each lane, as random.sample draws
+        # them from the list of the available servers in index order.
+        free = self.server_job_counts[lanes] == 0
+        free_count = free.sum(1)
+        width = max(counts.max(initial=0), 1)
+        positions = numpy.array(
+            [
+                self.rngs[lane].sample(range(population), count)
+                + [-1] * (width - count)
+                for lane, population, count in zip(
+                    lanes.tolist(), free_count.tolist(), counts.tolist()
+                )
+            ],
+            dtype=int,
+        ).reshape(len(lanes), width)
+        ranks = numpy.cumsum(free, axis=1) - 1
+        return free & (ranks[:, :, None] == positions[:, None, :]).any(2)
+
+    def _start(
+        self,
+        lanes,
+        kind,
+        request,
+        alpha,
+        data,
+        mass,
+        max_servers,
+        servers,
+        start,
+        end,
+        speed,
+    ):
+        # Starts one job in each lane, or consecutive jobs of the same lane.
+        slots, occurrence = self._free_slots(lanes)
+        self.active[lanes, slots] = True
+        self.kind[lanes, slots] = kind
+        self.request[lanes, slots] = request
+        self.job_alpha[lanes, slots] = alpha
+        self.job_data[lanes, slots] = data
+        self.job_mass[lanes, slots] = mass
+        self.job_max_servers[lanes, slots] = max_servers
+        self.job_server_count[lanes, slots] = servers.sum(1)
+        self.servers[lanes, slots] = servers
+        self.start[lanes, slots] = start
+        self.end[lanes, slots] = end
+        self.speed[lanes, slots] = speed
+        if occurrence is None:
+            self.start_order[lanes, slots] = self._start_counter[lanes]
+            self._start_counter[lanes] += 1
+            self.server_job_counts[lanes] += servers
+            if kind != self.POWER_OFF:
+                self.working_count[lanes] += 1
+            return
+        self.start_order[lanes, slots] = self._start_counter[lanes] + occurrence
+        numpy.add.at(self._start_counter, lanes, 1)
+        numpy.add.at(self.server_job_counts, lanes, servers)
+        if kind != self.POWER_OFF:
+            numpy.add.at(self.working_count, lanes, 1)
+
+    def _free_slots(self, lanes):
+        # A free slot for each job, adding slots to all the lanes if needed. The
+        # jobs of a lane must be consecutive, their occurrence in the lane being
+        # returned, None if every lane starts one job.
+        occurrence = None
+        needed = 1
+        if len(lanes) > 1 and (lanes[1:] == lanes[:-1]).any():
+            index = numpy.arange(len(lanes))
+            first = numpy.ones(len(lanes), dtype=bool)
+            first[1:] = lanes[1:] != lanes[:-1]
+            occurrence = index - numpy.maximum.accumulate(numpy.where(first, index, 0))
+            needed = occurrence + 1
+        free = ~self.active[lanes]
+        while not (free.sum(1) >= needed).all():
+            for name in (
+                "active",
+                "kind",
+                "request",
+                "job_alpha",
+                "job_data",
+                "job_mass",
+                "job_max_servers",
+                "job_server_count",
+                "speed",
+                "start",
+                "end",
+                "start_order",
+                "servers",
+            ):
+                array = getattr(self, name)
+                setattr(
+                    self, name, numpy.concatenate((array, numpy.zeros_like(array)), 1)
+                )
+            free = ~self.active[lanes]
+        if occurrence is None:
+            return free.argmax(1), None
+        ranks = numpy.cumsum(free, axis=1) - 1
+        return (free & (ranks == occurrence[:, None])).argmax(1), occurrence
+
+    def _remove_in_order(self, lanes, removed):
+        # Removes the jobs of the mask, accounting for them as StatsAccumulator.add
+        # in starting order within each lane. Returns the lanes removing jobs,
+        # the slots of their removed jobs in starting order, padded at the end,
+        # and the mask of the removed jobs among these slots.
+        removed_count = removed.sum(1)
+        removing = removed_count > 0
+        if not removing.all():
+            lanes, removed = lanes[removing], removed[removing]
+            removed_count = removed_count[removing]
+        if not len(lanes):
+            return lanes, numpy.empty((0, 0), dtype=int), numpy.empty((0, 0), bool)
+        order = numpy.where(removed, self.start_order[lanes], numpy.iinfo(int).max)
+        width = removed_count.max()
+        slots = numpy.argsort(order, axis=1, kind="stable")[:, :width]
+        ranked = numpy.arange(width) < removed_count[:, None]
+
+        rows = lanes[:, None]
+        kind = self.kind[rows, slots]
+        start = self.start[rows, slots]
+        end = self.end[rows, slots]
+        duration = end - start
+        server_count = self.job_server_count[rows, slots]
+        power_off = ranked & (kind == self.POWER_OFF)
+        working = ranked & ~power_off
+        energy = numpy.where(
+            power_off,
+            Server.Consumption.reboot(duration),
+            Server.Consumption.active(duration),
+        )
+        # The sums are accumulated job after job, as by the Scheduler, the padding
+        # adding zeros.
+        self.energy[lanes] = numpy.cumsum(
+            numpy.column_stack(
+                (self.energy[lanes], numpy.where(ranked, energy * server_count, 0.0))
+            ),
+            axis=1,
+        )[:, -1]
+        self.area[lanes] = numpy.cumsum(
+            numpy.column_stack(
+                (self.area[lanes], numpy.where(ranked, duration * server_count, 0.0))
+            ),
+            axis=1,
+        )[:, -1]
+        self.start_time[lanes] = numpy.minimum(
+            self.start_time[lanes], numpy.where(ranked, start, inf).min(1)
+        )
+        self.end_time[lanes] = numpy.maximum(
+            self.end_time[lanes], numpy.where(ranked, end, -inf).max(1)
+        )
+        self.reconfig_count[lanes] += (ranked & (kind == self.RECONFIGURATION)).sum(1)
+        self.power_off_count[lanes] += power_off.sum(1)
+        # A request ending several jobs at once ends them at the same instant.
+        self.last_end_times[
+            numpy.broadcast_to(rows, slots.shape)[working],
+            self.request[rows, slots][working],
+        ] = end[working]
+        self.working_count[lanes] -= working.sum(1)
+        self.server_job_counts[lanes] -= (
+            self.servers[lanes] & removed[:, :, None]
+        ).sum(1)
+        self.active[lanes] &= ~removed
+        return lanes, slots, ranked
+
+    def _remove(self, lanes, slots):
+        # Removes one job from each lane.
+        removed = numpy.zeros((len(lanes), self.active.shape[1]), dtype=bool)
+        removed[numpy.arange(len(lanes)), slots] = True
+        self._remove_in_order(lanes, removed)
+
+    def _retire(self, lanes, requests, retiring):
+        # Records the stretch times of the complete requests of the mask, in
+        # column order within each lane.
+        rows = numpy.broadcast_to(lanes[:, None], requests.shape)[retiring]
+        positions = self._retired_count[lanes, None] + numpy.cumsum(retiring, 1) - 1
+        requests = requests[retiring]
+        self._retired[rows, requests] = True
+        self._retired_stretch_times[rows, positions[retiring]] = (
+            self.last_end_times[rows, requests] - self.sub_time[rows, requests]
+        ) / self.mass[rows, requests]
+        self._retired_count[lanes] += retiring.sum(1)
+
+    def _stats(self, lane: int):
+        # The statistics of a lane, as Scheduler.stats with weights of 1.
+        if self.keep_segments:
+            request_count = self.next_request[lane]
+            stretch_times = (
+                (
+                    self.last_end_times[lane, :request_count]
+                    - self.sub_time[lane, :request_count]
+                )
+                / self.mass[lane, :request_count]
+            ).tolist()
+            min_stretch_time = min(stretch_times)
+            max_stretch_time = max(stretch_times)
+            mean_stretch_time = mean(stretch_times)
+            stdev_stretch_time = stdev(stretch_times) if len(stretch_times) > 1 else nan
+        else:
+            stretch_times = self._retired_stretch_times[
+                lane, : self._retired_count[lane]
+            ].tolist()
+            min_stretch_time, max_stretch_time = inf, -inf
+            mean_stretch_time, squared_deviations = 0, 0
+            for count, stretch_time in enumerate(stretch_times, 1):
+                min_stretch_time = min(min_stretch_time, stretch_time)
+                max_stretch_time = max(max_stretch_time, stretch_time)
+                delta = stretch_time - mean_stretch_time
+                mean_stretch_time += delta / count
+                squared_deviations += delta * (stretch_time - mean_stretch_time)
+            stdev_stretch_time = (
+                sqrt(squared_deviations / (len(stretch_times) - 1))
+                if len(stretch_times) > 1
+                else nan
+            )
+
+        start_time = self.start_time[lane].item()
+        end_time = self.end_time[lane].item()
+        work_duration = end_time - start_time
+        energy_idle = Server.Consumption.idle(
+            work_duration * self.server_count - self.area[lane].item()
+        )
+        idle_power = Server.Consumption.idle(work_duration) * self.server_count
+        average_power_norm = (self.energy[lane].item() + energy_idle) / idle_power
+        return SchedulerStats(
+            complete_jobs={},
+            start_time=start_time,
+            end_time=end_time,
+            work_duration=work_duration,
+            reconfig_count=self.reconfig_count[lane].item(),
+            power_off_count=self.power_off_count[lane].item(),
+            min_stretch_time=min_stretch_time,
+            max_stretch_time=max_stretch_time,
+            mean_stretch_time=mean_stretch_time,
+            stdev_stretch_time=stdev_stretch_time,
+            average_power_norm=average_power_norm,
+            cost=mean_stretch_time**1 * average_power_norm**1,
+        )
+
+    @staticmethod
+    def _pad(workloads: list, name: str, width: int, fill):
+        # One column of the workloads as a lanes x width array.
+        column = numpy.full((len(workloads), width), fill)
+        for lane, workload in enumerate(workloads):
+            values = getattr(workload, name)
+            column[lane, : len(values)] = values
+        return column
+
+    @staticmethod
+    def _power(bases, exponents):
+        # Elementwise power computed by Python, as in the Scheduler, since the
+        # vectorized power of numpy may differ in the last digit.
+        bases, exponents = numpy.broadcast_arrays(bases, exponents)
+        return numpy.array(
+            [
+                base**exponent
+                for base, exponent in zip(bases.tolist(), exponents.tolist())
+            ],
+            dtype=float,
+        )
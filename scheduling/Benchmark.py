@@ -0,0 +1,355 @@
+import json
+import tracemalloc
+from dataclasses import asdict, dataclass
+from itertools import product
+from pathlib import Path
+from random import seed
+from time import perf_counter
+
+import numpy
+import structlog
+
+from .Event import EventQueue
+from .Experiments import Experiments
+from .Scheduler import Scheduler, SchedulerConfig
+from .Swarm import Swarm
+from .Workload import Workload
+from .WorkloadCache import WorkloadCache
+
+
+@dataclass
+class BenchmarkResult:
+    """A container for the measures of one benchmark case.
+    """
+
+    name: str  #: The name of the benchmarked operation.
+    server_count: int  #: The total number of servers.
+    job_count: int  #: The number of jobs of each simulated workload.
+    seconds: float  #: The best duration of the operation, in seconds.
+    seconds_per_job: float  #: The best duration divided by the simulated jobs.
+    peak_memory: int  #: The peak of the memory allocated by the case, in bytes.
+
+    @property
+    def key(self):
+        """str: The identifier of the case in the baselines."""
+        return f"{self.name}/{self.server_count}/{self.job_count}"
+
+    def to_dict(self):
+        """Converts the attributes of a BenchmarkResult object into a dictionary.
+        """
+        return asdict(self)
+
+
+class Benchmark:
+    """A suite timing the hot paths of the simulator over a sweep of sizes.
+
+    Every case runs once under tracemalloc to measure its peak memory, then
+    ``repeat`` times untraced, keeping the best duration. The results can be
+    stored as a baseline, against which later runs are compared.
+    """
+
+    NAMES = (
+        "generate_jobs",
+        "generate_workload",
+        "run_expt",
+        "update_schedule",
+        "stats",
+        "swarm_epoch",
+        "swarm_epoch_batch",
+    )  #: The names of the benchmarked operations.
+    SWARM_PARTICLES = 8  #: The Particles count of the benchmarked Swarm.
+    SWARM_EXPERIMENTS = 5  #: The experiments count of each benchmarked Particle.
+    MAX_SIZE = 10 ** 7
+    """The default maximum product of the servers and jobs counts of a case, \
+    which keeps the 1M jobs on 5 servers cases."""
+    TOLERANCE = 0.5
+    """The default allowed relative increase of the measures over the baseline, \
+    short cases on a busy machine varying by tens of percents between runs."""
+    MIN_SECONDS = 0.01
+    """The duration under which the times of a case are not compared, as they \
+    vary more than any tolerance, only its peak memory being compared."""
+
+    def __init__(
+        self,
+        server_counts=(5, 50),
+        job_counts=(50, 500),
+        names=NAMES,
+        repeat=3,
+        max_size=MAX_SIZE,
+        seed_num=1,
+    ):
+        """Creates a Benchmark object.
+
+        Args:
+            server_counts: The servers counts of the sweep.
+            job_counts: The jobs counts of the sweep.
+            names: The names of the benchmarked operations, among NAMES.
+            repeat: The count of timed runs of each case.
+            max_size: The maximum product of the servers and jobs counts of a \
+            case, larger cases of the sweep are skipped.
+            seed_num: The seed of the generated workloads.
+        """
+        unknown = set(names) - set(self.NAMES)
+        if unknown:
+            raise ValueError(f"Unknown benchmarks: {sorted(unknown)}")
+        self.server_counts = list(server_counts)  #: The servers counts of the sweep.
+        self.job_counts = list(job_counts)  #: The jobs counts of the sweep.
+        self.names = list(names)  #: The names of the benchmarked operations.
+        self.repeat = repeat  #: The count of timed runs of each case.
+        self.max_size = max_size
+        """The maximum product of the servers and jobs counts of a case."""
+        self.seed_num = seed_num  #: The seed of the generated workloads.
+        self.logger = structlog.getLogger(__name__)  #: The Benchmark's logger.
+
+    def run(self):
+        """Runs every case of the sweep.
+
+        Returns:
+            list: A list of BenchmarkResult objects.
+        """
+        results = []
+        for name, server_count, job_count in product(
+            self.names, self.server_counts, self.job_counts
+        ):
+            if server_count * job_count > self.max_size:
+                continue
+            result = self.measure(name, server_count, job_count)
+            self.logger.info(
+                "benchmark",
+                case=result.key,
+                seconds=result.seconds,
+                seconds_per_job=result.seconds_per_job,
+                peak_memory=result.peak_memory,
+            )
+            results.append(result)
+        return results
+
+    def measure(self, name: str, server_count: int, job_count: int):
+        """Measures one case.
+
+        Args:
+            name: The name of the benchmarked operation.
+            server_count: The total number of servers.
+            job_count: The number of jobs of each simulated workload.
+
+        Returns:
+            BenchmarkResult: The measures of the case.
+        """
+        case = getattr(self, f"_{name}")
+
+        tracemalloc.start()
+        try:
+            case(server_count, job_count)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        seconds, simulated_jobs = min(
+            case(server_count, job_count) for _ in range(self.repeat)
+        )
+        return BenchmarkResult(
+            name,
+            server_count,
+            job_count,
+            seconds,
+            seconds / simulated_jobs,
+            peak_memory,
+        )
+
+    def validate_batch(self, server_counts=(2, 5, 20), experiment_count=10):
+        """Checks that lockstep simulations reproduce the Scheduler.
+
+        Experiments of random configurations are run one by one by the
+        Scheduler and together by a BatchScheduler, on the same seeds, for every
+        combination of the reconfiguration, power-off, decision process and
+        segments flags, and with the legacy workload. Their statistics and the
+        random states they leave must be identical.
+
+        Args:
+            server_counts: The servers counts of the experiments.
+            experiment_count: The count of experiments of each combination.
+
+        Returns:
+            list: The descriptions of the differing experiments, empty if none.
+        """
+        seed(self.seed_num)
+        configs = [SchedulerConfig.random() for _ in range(experiment_count)]
+        seeds = list(range(self.seed_num, self.seed_num + experiment_count))
+        flag_sets = [
+            dict(
+                reconfig_enabled=reconfig,
+                power_off_enabled=power_off,
+                param_enabled=param,
+                keep_segments=keep_segments,
+            )
+            for reconfig, power_off, param, keep_segments in product(
+                (True, False), repeat=4
+            )
+        ]
+        flag_sets.append(dict(legacy_workload=True))
+
+        differences = []
+        workload_cache = WorkloadCache()
+        for server_count, flags in product(server_counts, flag_sets):
+            experiments = Experiments(workload_cache=workload_cache, **flags)
+            expected = experiments.run_cached(configs, server_count, seeds)
+            actual = experiments.run_batch(
+                configs, server_count, seeds, crossover=False
+            )
+            for seed_num, (stats, rng_state), (batch_stats, batch_rng_state) in zip(
+                seeds, expected, actual
+            ):
+                batch_values = batch_stats.to_dict()
+                names = [
+                    name
+                    for name, value in stats.to_dict().items()
+                    if not _same_value(value, batch_values[name])
+                ]
+                if not _same_rng_state(rng_state, batch_rng_state):
+                    names.append("rng_state")
+                if names:
+                    differences.append(
+                        f"{server_count} servers, {flags}, seed {seed_num}: "
+                        + ", ".join(names)
+                    )
+        return differences
+
+    @staticmethod
+    def save_baseline(results: list, path):
+        """Writes results as a baseline.
+
+        Directories referenced by path are created similar to mkdir -p.
+
+        Args:
+            results: A list of BenchmarkResult objects.
+            path: The location of the JSON baseline file.
+        """
+        path = Path(path)
+        path.parent.mkdir(0o755, parents=True, exist_ok=True)
+        baseline = {result.key: result.to_dict() for result in results}
+        path.write_text(json.dumps(baseline, indent=2))
+
+    @staticmethod
+    def compare(results: list, path, tolerance=TOLERANCE):
+        """Compares results to a baseline.
+
+        Args:
+            results: A list of BenchmarkResult objects.
+            path: The location of the JSON baseline file.
+            tolerance: The allowed relative increase of the time per job and of \
+            the peak memory.
+
+        Returns:
+            list: The descriptions of the regressions, empty if none. Cases \
+            missing from the baseline are ignored, as are the times of the cases \
+            shorter than MIN_SECONDS.
+        """
+        baseline = json.loads(Path(path).read_text())
+        regressions = []
+        for result in results:
+            reference = baseline.get(result.key)
+            if reference is None:
+                continue
+            measures = ["peak_memory"]
+            if max(result.seconds, reference["seconds"]) >= Benchmark.MIN_SECONDS:
+                measures.insert(0, "seconds_per_job")
+            for measure in measures:
+                value, limit = getattr(result, measure), reference[measure]
+                if value > limit * (1 + tolerance):
+                    regressions.append(
+                        f"{result.key}: {measure} {value:.3g} > {limit:.3g}"
+                    )
+        return regressions
+
+    def _generate_jobs(self, server_count: int, job_count: int):
+        # The historical job by job generator.
+        experiments = Experiments(legacy_workload=True)
+        start = perf_counter()
+        experiments._generate_jobs(job_count, server_count, self.seed_num)
+        return perf_counter() - start, job_count
+
+    def _generate_workload(self, server_count: int, job_count: int):
+        # The batched workload generator.
+        start = perf_counter()
+        Workload.generate(job_count, server_count, self.seed_num)
+        return perf_counter() - start, job_count
+
+    def _run_expt(self, server_count: int, job_count: int):
+        # One whole experiment: generation, simulation and statistics.
+        experiments = self._experiments(job_count)
+        start = perf_counter()
+        experiments._run_expt(SchedulerConfig(), server_count, self.seed_num)
+        return perf_counter() - start, job_count
+
+    def _update_schedule(self, server_count: int, job_count: int):
+        # The time spent in the updates of the schedule during one experiment.
+        return self._simulate(server_count, job_count)[0], job_count
+
+    def _stats(self, server_count: int, job_count: int):
+        # The computation of the statistics at the end of one experiment.
+        scheduler = self._simulate(server_count, job_count)[1]
+        start = perf_counter()
+        scheduler.stats(stretch_time_weight=1, energy_weight=1)
+        return perf_counter() - start, job_count
+
+    def _swarm_epoch(self, server_count: int, job_count: int, batch=False):
+        # One epoch of a Swarm evaluating all its Particles.
+        swarm = Swarm(
+            self.seed_num,
+            self.SWARM_PARTICLES,
+            server_count,
+            num_exp=self.SWARM_EXPERIMENTS,
+            batch=batch,
+        )
+        swarm.experiment.GENERATED_JOBS_COUNT = job_count
+        start = perf_counter()
+        swarm._run_epoch(0, None)
+        simulated_jobs = self.SWARM_PARTICLES * self.SWARM_EXPERIMENTS * job_count
+        return perf_counter() - start, simulated_jobs
+
+    def _swarm_epoch_batch(self, server_count: int, job_count: int):
+        # One epoch of a Swarm simulating all its experiments in lockstep.
+        return self._swarm_epoch(server_count, job_count, batch=True)
+
+    def _experiments(self, job_count: int):
+        # An Experiments object generating workloads of job_count jobs.
+        experiments = Experiments()
+        experiments.GENERATED_JOBS_COUNT = job_count
+        return experiments
+
+    def _simulate(self, server_count: int, job_count: int):
+        # Runs one experiment, timing the updates of the schedule. Returns the
+        # time spent in update_schedule and the stopped Scheduler.
+        events = EventQueue()
+        scheduler = Scheduler(
+            server_count, SchedulerConfig(), events=events, keep_jobs=False
+        )
+        workload = Workload.generate(job_count, server_count, self.seed_num)
+        seed(self.seed_num)
+
+        update_schedule = scheduler.update_schedule
+        elapsed = 0
+
+        def timed_update_schedule(time):
+            nonlocal elapsed
+            start = perf_counter()
+            update_schedule(time)
+            elapsed += perf_counter() - start
+
+        scheduler.update_schedule = timed_update_schedule
+        time = Experiments()._simulate(scheduler, events, workload.requests())
+        scheduler.stop(time)
+        return elapsed, scheduler
+
+
+def _same_value(value, other):
+    # Equality of two statistics, the undefined ones being equal.
+    return value == other or (value != value and other != other)
+
+
+def _same_rng_state(rng_state, other):
+    # Equality of two RngStates, whose numpy states hold arrays.
+    return rng_state.python_state == other.python_state and all(
+        numpy.array_equal(part, other_part)
+        for part, other_part in zip(rng_state.numpy_state, other.numpy_state)
+    )
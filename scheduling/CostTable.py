@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import numpy
+import pandas
+
+
+class CostTable:
+    """A table of the statistics of simulated runs, rescored under any weights.
+
+    The cost of a run is ``mean_stretch_time ** stretch_time_weight *
+    average_power_norm ** energy_weight``. As the components do not depend on
+    the weights, a table of the statistics of the runs is enough to compute
+    their costs under a whole grid of weights, without simulating again.
+    """
+
+    COMPONENTS = ("mean_stretch_time", "average_power_norm")
+    """The statistics of a run entering its cost."""
+
+    def __init__(self, records: pandas.DataFrame):
+        """Creates a CostTable object.
+
+        Args:
+            records: A DataFrame with one row per run and at least the \
+            COMPONENTS columns.
+        """
+        missing = set(self.COMPONENTS) - set(records.columns)
+        if missing:
+            raise ValueError(f"Missing cost components: {sorted(missing)}")
+        self.records = records.reset_index(drop=True)
+        """pandas.DataFrame: The statistics of the runs, one row per run."""
+
+    def __len__(self):
+        return len(self.records)
+
+    @classmethod
+    def from_stats(cls, stats: list):
+        """Builds a CostTable from the statistics of runs.
+
+        Args:
+            stats: A list of SchedulerStats objects.
+
+        Returns:
+            CostTable: A CostTable object.
+        """
+        return cls(pandas.DataFrame([stat.to_dict() for stat in stats]))
+
+    @classmethod
+    def load(cls, path):
+        """Reads a CostTable written by save.
+
+        Args:
+            path: The location of the csv file.
+
+        Returns:
+            CostTable: A CostTable object.
+        """
+        return cls(pandas.read_csv(path, float_precision="round_trip"))
+
+    def save(self, path):
+        """Writes the CostTable as a csv file.
+
+        Directories referenced by path are created similar to mkdir -p.
+
+        Args:
+            path: The location of the csv file.
+        """
+        path = Path(path)
+        path.parent.mkdir(0o755, parents=True, exist_ok=True)
+        self.records.to_csv(path, index=False)
+
+    def costs(self, stretch_time_weights, energy_weights):
+        """Computes the cost of every run under pairs of weights.
+
+        The powers are computed by numpy in one broadcast operation, and may
+        differ from the costs of Scheduler.stats in the last digit.
+
+        Args:
+            stretch_time_weights: The exponent weights of the mean stretch time.
+            energy_weights: The exponent weights of the average normalized \
+            power, broadcast against stretch_time_weights.
+
+        Returns:
+            numpy.array: The costs, one row per pair of weights and one column \
+            per run.
+        """
+        stretch_time_weights, energy_weights = numpy.broadcast_arrays(
+            numpy.ravel(stretch_time_weights), numpy.ravel(energy_weights)
+        )
+        mean_stretch_time = self.records["mean_stretch_time"].to_numpy(float)
+        average_power_norm = self.records["average_power_norm"].to_numpy(float)
+        return (
+            mean_stretch_time ** stretch_time_weights[:, None]
+            * average_power_norm ** energy_weights[:, None]
+        )
+
+    def grid(self, stretch_time_weights, energy_weights):
+        """Summarizes the costs of the runs over a grid of weights.
+
+        Args:
+            stretch_time_weights: The exponent weights of the mean stretch time.
+            energy_weights: The exponent weights of the average normalized power.
+
+        Returns:
+            pandas.DataFrame: One row per pair of weights of the cartesian \
+            product, with the mean, standard deviation, minimum and maximum of \
+            the costs of the runs.
+        """
+        stretch_time_grid, energy_grid = numpy.meshgrid(
+            stretch_time_weights, energy_weights, indexing="ij"
+        )
+        costs = self.costs(stretch_time_grid, energy_grid)
+        return pandas.DataFrame(
+            {
+                "stretch_time_weight": stretch_time_grid.ravel(),
+                "energy_weight": energy_grid.ravel(),
+                "mean_cost": costs.mean(axis=1),
+                "std_cost": costs.std(axis=1, ddof=1) if len(self) > 1 else numpy.nan,
+                "min_cost": costs.min(axis=1),
+                "max_cost": costs.max(axis=1),
+            }
+        )
@@ -0,0 +1,122 @@
+import shelve
+from collections import OrderedDict
+from pathlib import Path
+
+
+class EvaluationCache:
+    """A memoized store of the results of experiments.
+
+    The results are the SchedulerStats of an experiment along with the RngState
+    it left, so that a cached experiment leaves the random state of the calling
+    process as if it had been run. They are keyed by the configuration, quantized
+    to ``digits`` significant digits, and by the settings of the experiment.
+
+    Results are kept in a least recently used in-memory tier and, optionally, in
+    an on-disk ``shelve`` tier reused across runs. The cache is only looked up
+    and filled by the process owning it, see Experiments.run_cached: the copies
+    sent to worker processes along with their Experiments are emptied and
+    disconnected from the on-disk tier, anything they would store being lost.
+    """
+
+    VERSION = 2
+    """The version of the stored results, changed when the simulation changes."""
+
+    def __init__(self, max_size=1024, directory=None, digits=12):
+        """Creates an EvaluationCache object.
+
+        Args:
+            max_size: The maximum count of results kept in memory.
+            directory: The directory of the on-disk tier, created similar to \
+            mkdir -p. The on-disk tier is disabled if None.
+            digits: The count of significant digits of the configuration values \
+            kept in the keys. Configurations rounding to the same values share \
+            their results.
+        """
+        self.max_size = max_size  #: The maximum count of results kept in memory.
+        self.directory = None if directory is None else Path(directory)
+        """The directory of the on-disk tier, None if disabled."""
+        self.digits = digits  #: The significant digits of the configuration values.
+        self.hits = 0  #: The count of results found in the cache.
+        self.misses = 0  #: The count of results that had to be computed.
+        self._results = OrderedDict()  #: The in-memory tier, in LRU order.
+
+    def __len__(self):
+        return len(self._results)
+
+    def __getstate__(self):
+        # Only the settings are sent to worker processes, not the stored results
+        # nor the on-disk tier, which the owning process alone reads and fills.
+        state = self.__dict__.copy()
+        state["_results"] = OrderedDict()
+        state["directory"] = None
+        return state
+
+    def key(self, values: list, settings: tuple):
+        """Builds the key of an experiment.
+
+        Args:
+            values: The values of the SchedulerConfig of the experiment.
+            settings: A tuple of the other parameters of the experiment: the \
+            seed, servers count, jobs count and feature flags.
+
+        Returns:
+            tuple: The key of the experiment.
+        """
+        quantized = tuple(float(f"{value:.{self.digits}g}") for value in values)
+        return (self.VERSION, quantized, *settings)
+
+    def get(self, key: tuple):
+        """Gets the result of an experiment.
+
+        Args:
+            key: The key of the experiment, see key.
+
+        Returns:
+            tuple: The SchedulerStats and RngState of the experiment, None if \
+            not stored.
+        """
+        result = self._results.get(key)
+        if result is None:
+            result = self._load(key)
+            if result is not None:
+                self._remember(key, result)
+        else:
+            self._results.move_to_end(key)
+
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, key: tuple, result: tuple):
+        """Stores the result of an experiment.
+
+        Args:
+            key: The key of the experiment, see key.
+            result: A tuple of the SchedulerStats and RngState of the experiment.
+        """
+        self._remember(key, result)
+        self._save(key, result)
+
+    def _remember(self, key: tuple, result: tuple):
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+    def _path(self):
+        return str(self.directory / "evaluations")
+
+    def _load(self, key: tuple):
+        if self.directory is None or not self.directory.exists():
+            return None
+        with shelve.open(self._path(), flag="c") as shelf:
+            return shelf.get(repr(key))
+
+    def _save(self, key: tuple, result: tuple):
+        if self.directory is None:
+            return
+        self.directory.mkdir(0o755, parents=True, exist_ok=True)
+        with shelve.open(self._path()) as shelf:
+            shelf[repr(key)] = result
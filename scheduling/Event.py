@@ -0,0 +1,120 @@
+import heapq
+from dataclasses import dataclass, field
+from enum import IntEnum
+from itertools import count
+
+
+class EventKind(IntEnum):
+    """The kinds of events that can change the state of a simulation.
+    """
+
+    ARRIVAL = 0  #: A JobRequest is submitted to the scheduler.
+    COMPLETION = 1  #: A Job finishes its computations.
+    RECONFIGURATION_END = 2  #: A reconfiguration finishes transferring its data.
+    POWER_OFF_END = 3  #: A powered off server is available again.
+
+    @classmethod
+    def from_job(cls, job):
+        """Finds the kind of event marking the end of a Job.
+
+        Args:
+            job: The Job whose end is being scheduled.
+
+        Returns:
+            EventKind: The kind of the ending event.
+        """
+        if job.is_power_off():
+            return cls.POWER_OFF_END
+        if job.is_reconfiguration():
+            return cls.RECONFIGURATION_END
+        return cls.COMPLETION
+
+
+@dataclass(order=True)
+class Event:
+    """An instant at which the state of the simulation changes.
+
+    Events are ordered by time, then by insertion order.
+    """
+
+    time: float  #: The instant at which the event takes place.
+    seq: int  #: The insertion order, used to break ties between equal times.
+    kind: EventKind = field(compare=False)  #: The kind of the event.
+    payload: object = field(compare=False)
+    """The object the event refers to: a JobRequest for arrivals, a Job otherwise."""
+
+    def is_stale(self):
+        """Checks whether the event no longer matches its Job.
+
+        A Job interrupted by a reconfiguration keeps its original ending event
+        in the queue, that event must then be ignored.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        return self.kind is not EventKind.ARRIVAL and self.payload.end_time != self.time
+
+
+class EventQueue:
+    """A priority queue of the upcoming events of a simulation.
+    """
+
+    def __init__(self):
+        """Creates an empty EventQueue object.
+        """
+        self._heap = []  #: The binary heap holding the Event objects.
+        self._counter = count()  #: A generator of insertion sequence numbers.
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __repr__(self):
+        return f"EventQueue: {sorted(self._heap)}"
+
+    def push(self, time, kind: EventKind, payload=None):
+        """Adds an event to the queue.
+
+        Args:
+            time: The instant at which the event takes place.
+            kind: The kind of the event.
+            payload: The object the event refers to.
+        """
+        heapq.heappush(self._heap, Event(time, next(self._counter), kind, payload))
+
+    def push_job_end(self, job):
+        """Adds the ending event of a Job to the queue.
+
+        Args:
+            job: The started Job.
+        """
+        self.push(job.end_time, EventKind.from_job(job), job)
+
+    def peek_time(self):
+        """Gets the time of the earliest event without removing it.
+
+        Returns:
+            The instant of the earliest event, None if the queue is empty.
+        """
+        return self._heap[0].time if self._heap else None
+
+    def pop_next(self):
+        """Removes all the valid events sharing the earliest time.
+
+        Stale events are discarded on the way.
+
+        Returns:
+            tuple: The instant of the events and the list of popped Event objects,\
+            (None, []) if no valid event remains.
+        """
+        while self._heap and self._heap[0].is_stale():
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None, []
+
+        time = self._heap[0].time
+        events = []
+        while self._heap and self._heap[0].time == time:
+            event = heapq.heappop(self._heap)
+            if not event.is_stale():
+                events.append(event)
+        return time, events
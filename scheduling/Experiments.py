@@ -1,11 +1,22 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from math import ceil, log, sqrt
 from random import randrange, seed, uniform
+from time import perf_counter
 
 import numpy
 import scipy.stats
 
+from .BatchScheduler import BatchScheduler
+from .EvaluationCache import EvaluationCache
+from .Event import EventKind, EventQueue
+from .Instrumentation import Instrumentation
 from .JobRequest import JobRequest
+from .RngState import RngState
 from .Scheduler import Scheduler, SchedulerConfig
+from .Tracer import Tracer
+from .Workload import Workload
+from .WorkloadCache import WorkloadCache
 
 
 class Experiments:
@@ -15,7 +26,19 @@ class Experiments:
     GENERATED_JOBS_COUNT = 50  #: Number of jobs to generate.
 
     def __init__(
-        self, reconfig_enabled=True, power_off_enabled=True, param_enabled=True,
+        self,
+        reconfig_enabled=True,
+        power_off_enabled=True,
+        param_enabled=True,
+        num_workers=1,
+        legacy_workload=False,
+        workload_cache: WorkloadCache = None,
+        keep_jobs=False,
+        tracer: Tracer = None,
+        keep_segments=True,
+        instrument=False,
+        evaluation_cache: EvaluationCache = None,
+        batch=False,
     ):
         """Constructs an Experiments object.
 
@@ -23,11 +46,80 @@ class Experiments:
             reconfig_enabled: A flag for enabling reconfigurations.
             power_off_enabled: A flag for enabling power-offs.
             param_enabled: A flag for enabling the decision making process.
+            num_workers: The count of processes running the experiments of a \
+            run_expts call in parallel. The experiments run one after another if 1. \
+            The processes are started at the first parallel call and reused \
+            until close is called.
+            legacy_workload: A flag for generating the workloads job by job with \
+            the historical per-job seeding, reproducing the results obtained with \
+            previous versions for the same seeds.
+            workload_cache: The store in which generated workloads are memoized, \
+            workloads are generated for each experiment if None. The worker \
+            processes receive it with an empty in-memory tier, so only its \
+            on-disk tier spares them the generation.
+            keep_jobs: A flag for keeping the completed Job objects in the \
+            statistics, the schedules are only recorded as SegmentTables if False.\
+            Defaults to False.
+            tracer: The Tracer shared by the Schedulers of the experiments, \
+            nothing is recorded if None. The experiments then run in this \
+            process, one after another, so that it records all their events.
+            keep_segments: A flag for recording the schedules as SegmentTables. \
+            If False, the memory used by an experiment does not grow with its \
+            count of JobRequests.
+            instrument: A flag for counting the time and decisions of the phases \
+            of the simulations, returned as the instrumentation of the statistics.
+            evaluation_cache: The store in which the results of the experiments \
+            are memoized, every experiment is simulated if None. It is not used \
+            when tracing or instrumenting, which require the simulation to run.
+            batch: A flag for simulating the experiments of a run_expts call in \
+            lockstep with a BatchScheduler, one process running them all at \
+            once, if they are at least BatchScheduler.MIN_LANES. It is ignored \
+            when tracing, instrumenting or keeping the completed jobs, and the \
+            statistics do not hold the segments.
         """
         self.reconfig_enabled = reconfig_enabled
         """A flag for enabling reconfigurations."""
         self.power_off_enabled = power_off_enabled  #: A flag for enabling power-offs.
         self.param_enabled = param_enabled  #: A flag for enabling power-offs.
+        self.num_workers = num_workers
+        """The count of processes running the experiments in parallel."""
+        self.legacy_workload = legacy_workload
+        """A flag for generating the workloads with the historical per-job seeding."""
+        self.workload_cache = workload_cache
+        """WorkloadCache: The store of generated workloads, None if disabled."""
+        self.keep_jobs = keep_jobs  #: A flag for keeping the completed Job objects.
+        self.tracer = tracer  #: Tracer: The recorder of the scheduling events.
+        self.keep_segments = keep_segments
+        """A flag for recording the schedules as SegmentTables."""
+        self.instrument = instrument
+        """A flag for counting the time and decisions of the simulation phases."""
+        self.evaluation_cache = evaluation_cache
+        """EvaluationCache: The store of the results of the experiments, None if \
+        disabled."""
+        self.batch = batch
+        """A flag for simulating the experiments in lockstep with a BatchScheduler."""
+        self._executor = None  #: The pool of worker processes, None until needed.
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        # The copies sent to worker processes do not hold the pool.
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
+    def close(self):
+        """Stops the worker processes, if any.
+
+        A later parallel run starts new processes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
     def run_expts(
         self, config: SchedulerConfig, num_srvs: int, num_expts: int, seed_num: int
@@ -41,14 +133,242 @@ class Experiments:
             seed_num: A seed used to update the job generator.
 
         Returns:
-            list: A list of scheduling statistics.
+            list: A list of scheduling statistics, in the order of the seeds.
         """
+        seeds = range(seed_num, seed_num + num_expts)
+        if self.batch and self.can_batch():
+            results = self.run_batch([config] * num_expts, num_srvs, seeds)
+            if results:
+                _, rng_state = results[-1]
+                rng_state.restore()
+            return [stats for stats, _ in results]
+        if self.evaluation_cache is not None and not (self.tracer or self.instrument):
+            return self._run_cached_expts(config, num_srvs, seeds)
+        if self.num_workers > 1 and num_expts > 1 and self.tracer is None:
+            return self._run_expts_in_parallel(config, num_srvs, seeds)
+
         stats = []
-        for i in range(num_expts):
-            expt_stats = self._run_expt(config, num_srvs, seed_num + i)
+        for expt_seed in seeds:
+            expt_stats = self._run_expt(config, num_srvs, expt_seed)
             stats.append(expt_stats)
         return stats
 
+    def _run_expts_in_parallel(self, config: SchedulerConfig, num_srvs: int, seeds):
+        """Runs the experiments of each seed in a pool of processes.
+
+        Every experiment reseeds the job generator, so the runs do not depend on
+        each other. The random state left by the last experiment is restored in
+        the calling process, making the result identical to the serial one.
+
+        Args:
+            config: The configuration the Scheduler within the experiments.
+            num_srvs: The total number of servers.
+            seeds: The seeds of the experiments.
+
+        Returns:
+            list: A list of scheduling statistics, in the order of the seeds.
+        """
+        tasks = [(self, config, num_srvs, expt_seed) for expt_seed in seeds]
+        results = list(self._pool().map(_run_expt_task, tasks))
+
+        _, rng_state = results[-1]
+        rng_state.restore()
+        return [stats for stats, _ in results]
+
+    def _run_cached_expts(self, config: SchedulerConfig, num_srvs: int, seeds):
+        """Runs the experiments of each seed missing from the evaluation cache.
+
+        Every experiment reseeds the random state, so the random state left by
+        the last experiment, stored along with its statistics, is restored in the
+        end, making the result identical to running all the experiments.
+
+        Args:
+            config: The configuration the Scheduler within the experiments.
+            num_srvs: The total number of servers.
+            seeds: The seeds of the experiments.
+
+        Returns:
+            list: A list of scheduling statistics, in the order of the seeds.
+        """
+
+        def simulate(missing):
+            tasks = [(self, config, num_srvs, seeds[i]) for i in missing]
+            if self.num_workers > 1 and len(tasks) > 1:
+                return self._pool().map(_run_expt_task, tasks)
+            return map(_run_expt_task, tasks)
+
+        results = self._run_cached([config] * len(seeds), num_srvs, seeds, simulate)
+        if results:
+            _, rng_state = results[-1]
+            rng_state.restore()
+        return [stats for stats, _ in results]
+
+    def _pool(self):
+        # The pool of worker processes, started at the first call and reused by
+        # the following runs, its processes being spawned on demand.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.num_workers)
+        return self._executor
+
+    def run_cached(self, configs: list, num_srvs: int, seeds, executor=None):
+        """Runs experiments, simulating only the ones missing from the cache.
+
+        The evaluation cache is looked up and filled in this process, only the
+        missing experiments are sent to the executor. The copies of the
+        Experiments sent to worker processes hold an empty cache.
+
+        Args:
+            configs: The configuration of the Scheduler of each experiment.
+            num_srvs: The total number of servers.
+            seeds: The seed of each experiment.
+            executor: The executor simulating the missing experiments in \
+            parallel, they are simulated one after another if None.
+
+        Returns:
+            list: The SchedulerStats and the RngState left by each experiment, \
+            in the order of the experiments. The random state of the calling \
+            process is left unspecified.
+        """
+
+        def simulate(missing):
+            tasks = [(self, configs[i], num_srvs, seeds[i]) for i in missing]
+            if executor is None:
+                return map(_run_expt_task, tasks)
+            return executor.map(_run_expt_task, tasks)
+
+        return self._run_cached(configs, num_srvs, seeds, simulate)
+
+    def _run_cached(self, configs: list, num_srvs: int, seeds, simulate, batch=False):
+        """Looks up experiments in the evaluation cache, simulating the others.
+
+        Args:
+            configs: The configuration of the Scheduler of each experiment.
+            num_srvs: The total number of servers.
+            seeds: The seed of each experiment.
+            simulate: A function running the experiments of a list of indices, \
+            returning their SchedulerStats and RngState in the same order.
+            batch: A flag telling that simulate runs a BatchScheduler, whose \
+            statistics do not hold the segments.
+
+        Returns:
+            list: The SchedulerStats and the RngState left by each experiment, \
+            in the order of the experiments.
+        """
+        cache = self.evaluation_cache
+        if cache is None:
+            return list(simulate(range(len(configs))))
+
+        keys = [
+            cache.key(config.to_list(), self._settings(num_srvs, seed_num, batch))
+            for config, seed_num in zip(configs, seeds)
+        ]
+        results = [cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        for i, result in zip(missing, simulate(missing)):
+            cache.put(keys[i], result)
+            results[i] = result
+        return results
+
+    def can_batch(self):
+        """Tells whether the experiments can be simulated by a BatchScheduler.
+
+        Returns:
+            bool: False if tracing, instrumenting or keeping the completed jobs, \
+            which require the Scheduler.
+        """
+        return not (self.tracer or self.instrument or self.keep_jobs)
+
+    def run_batch(self, configs: list, num_srvs: int, seeds, crossover=True):
+        """Runs experiments in lockstep with a BatchScheduler.
+
+        The workloads are generated one after another, in the order of the
+        experiments, then simulated together. Each experiment starts from the
+        random state left by its workload, as in _run_expt, so its statistics
+        and the random state it leaves are the ones of _run_expt. The results
+        found in the evaluation cache are not simulated again.
+
+        The lockstep simulation costs a fixed overhead per event, so fewer than
+        BatchScheduler.MIN_LANES experiments are faster to run one by one.
+
+        Args:
+            configs: The configuration of the Scheduler of each experiment.
+            num_srvs: The total number of servers.
+            seeds: The seed of each experiment.
+            crossover: A flag for running the experiments one by one with the \
+            Scheduler when fewer than BatchScheduler.MIN_LANES are missing. \
+            Their statistics do not hold the segments either way.
+
+        Returns:
+            list: The SchedulerStats and the RngState left by each experiment, \
+            in the order of the experiments. The random state of the calling \
+            process is left unspecified.
+        """
+        return self._run_cached(
+            configs,
+            num_srvs,
+            seeds,
+            lambda missing: self._simulate_batch(
+                configs, num_srvs, seeds, missing, crossover
+            ),
+            batch=True,
+        )
+
+    def _simulate_batch(
+        self, configs: list, num_srvs: int, seeds, missing: list, crossover=True
+    ):
+        # Simulates the experiments of the indices missing in one BatchScheduler,
+        # or one by one below the crossover.
+        if crossover and len(missing) < BatchScheduler.MIN_LANES:
+            results = []
+            for i in missing:
+                stats = self._run_expt(configs[i], num_srvs, seeds[i])
+                stats.segments = None
+                results.append((stats, RngState.capture()))
+            return results
+
+        workloads, rng_states = [], []
+        for i in missing:
+            workloads.append(
+                self._generate_workload(self.GENERATED_JOBS_COUNT, num_srvs, seeds[i])
+            )
+            rng_states.append(RngState.capture())
+        scheduler = BatchScheduler(
+            num_srvs,
+            [configs[i] for i in missing],
+            workloads,
+            [rng_state.python_state for rng_state in rng_states],
+            self.reconfig_enabled,
+            self.power_off_enabled,
+            self.param_enabled,
+            keep_segments=self.keep_segments,
+        )
+        return [
+            (stats, RngState(rng.getstate(), rng_state.numpy_state))
+            for stats, rng, rng_state in zip(
+                scheduler.run(), scheduler.rngs, rng_states
+            )
+        ]
+
+    def _settings(self, num_srvs: int, seed_num: int, batch=False):
+        # The parameters of an experiment, besides its configuration. The
+        # statistics of a BatchScheduler follow keep_segments but never hold the
+        # segments, so they are not served to a run recording them.
+        return (
+            seed_num,
+            num_srvs,
+            self.GENERATED_JOBS_COUNT,
+            self.legacy_workload,
+            Workload.DYNAMISM,
+            Workload.MASS,
+            Workload.DISPARITY,
+            self.reconfig_enabled,
+            self.power_off_enabled,
+            self.param_enabled,
+            self.keep_jobs,
+            self.keep_segments,
+            self.keep_segments and not batch,
+        )
+
     def _run_expt(self, config: SchedulerConfig, num_srvs: int, seed_num: int):
         """Runs one experiment.
 
@@ -64,31 +384,166 @@ class Experiments:
             By default the weights of the reconfigurations and power-offs in the\
             in the resulting objects are 1.
         """
+        workload = self._generate_workload(
+            self.GENERATED_JOBS_COUNT, num_srvs, seed_num
+        )
+        return self._replay(config, num_srvs, workload.requests())
+
+    def run_trace(
+        self, config: SchedulerConfig, num_srvs: int, job_requests, seed_num=0
+    ):
+        """Runs one experiment on a recorded workload.
+
+        The JobRequests are consumed one at a time, so a trace streamed by a
+        TraceReader is replayed without being loaded whole.
+
+        Args:
+            config: The configuration the Scheduler within the experiment.
+            num_srvs: The total number of servers.
+            job_requests: An iterable of JobRequest objects sorted by submission \
+            time, e.g. a TraceReader generator.
+            seed_num: A seed of the random decisions of the Scheduler.
+
+        Returns:
+            SchedulerStats: A SchedulerStats object wrapping the statistics of \
+            the experiment, with weights of 1.
+
+        Raises:
+            ValueError: If the workload holds no JobRequest, e.g. a trace whose \
+            jobs were all skipped, which has no statistics.
+        """
+        job_requests = iter(job_requests)
+        first_request = next(job_requests, None)
+        if first_request is None:
+            raise ValueError("The workload to replay holds no JobRequest.")
+        seed(seed_num)
+        return self._replay(config, num_srvs, chain([first_request], job_requests))
+
+    def _replay(self, config: SchedulerConfig, num_srvs: int, job_requests):
+        """Simulates the scheduling of a workload.
+
+        Args:
+            config: The configuration the Scheduler within the experiment.
+            num_srvs: The total number of servers.
+            job_requests: An iterable of JobRequest objects sorted by submission \
+            time.
+
+        Returns:
+            SchedulerStats: A SchedulerStats object wrapping the statistics of \
+            the experiment, with weights of 1.
+        """
+        events = EventQueue()
         scheduler = Scheduler(
             num_srvs,
             config,
             self.reconfig_enabled,
             self.power_off_enabled,
             self.param_enabled,
+            events=events,
+            keep_jobs=self.keep_jobs,
+            tracer=self.tracer,
+            keep_segments=self.keep_segments,
+            instrumentation=Instrumentation() if self.instrument else None,
         )
+        time = self._simulate(scheduler, events, job_requests)
+
+        scheduler.stop(time)
+        return scheduler.stats(stretch_time_weight=1, energy_weight=1)
+
+    def _simulate(self, scheduler: Scheduler, events: EventQueue, jobs):
+        """Runs a discrete-event simulation until the scheduler stops working.
+
+        The schedule is only updated at the instants where an event takes place:
+        the submission of a JobRequest or the end of a Job, a reconfiguration or
+        a power-off. Only the next arrival is kept in the event queue.
+
+        Args:
+            scheduler: The Scheduler posting the ending events of its jobs into \
+            the events queue.
+            events: The queue of upcoming events.
+            jobs: An iterable of JobRequest objects sorted by submission time.
 
-        jobs = self._generate_jobs(Experiments.GENERATED_JOBS_COUNT, num_srvs, seed_num)
+        Returns:
+            The instant of the last processed event.
+        """
+        instrumentation = scheduler.instrumentation
+        clock = perf_counter()
+        arrivals = iter(jobs)
 
+        def push_next_arrival():
+            job = next(arrivals, None)
+            if job is not None:
+                events.push(job.sub_time, EventKind.ARRIVAL, job)
+            return job is not None
+
+        pending_arrival = push_next_arrival()
         time = 0
-        while jobs or scheduler.is_working():
-            for job in list(jobs):
-                if time < job.sub_time:
-                    break
-                scheduler.schedule(job)
-                jobs.remove(job)
+        while pending_arrival or scheduler.is_working():
+            next_time, batch = events.pop_next()
+            if next_time is None:
+                # Nothing can change the schedule anymore.
+                break
+            time = next_time
+            for event in batch:
+                if event.kind is EventKind.ARRIVAL:
+                    scheduler.schedule(event.payload)
+                    pending_arrival = push_next_arrival()
+                    if instrumentation is not None:
+                        instrumentation.arrival_count += 1
             scheduler.update_schedule(time)
-            time += 10
+            if instrumentation is not None:
+                instrumentation.event_batch_count += 1
 
-        scheduler.stop(time)
-        return scheduler.stats(stretch_time_weight=1, energy_weight=1)
+        if instrumentation is not None:
+            instrumentation.simulate_time += perf_counter() - clock
+        return time
+
+    def _generate_workload(self, job_count, server_count, seed_num):
+        """Generates the workload of one experiment.
+
+        The global random module, from which the Scheduler draws its decisions,
+        is seeded as well so that an experiment only depends on its seed.
+
+        Args:
+            job_count: The number of jobs to be generated.
+            server_count: The total number of servers.
+            seed_num: A seed used to update the job generator.
+
+        Returns:
+            Workload: The generated Workload object.
+        """
+
+        def generate():
+            if self.legacy_workload:
+                return Workload.from_requests(
+                    self._generate_jobs(job_count, server_count, seed_num)
+                )
+            return Workload.generate(job_count, server_count, seed_num)
+
+        if self.workload_cache is None:
+            workload = generate()
+        else:
+            key = (
+                seed_num,
+                server_count,
+                job_count,
+                self.legacy_workload,
+                Workload.DYNAMISM,
+                Workload.MASS,
+                Workload.DISPARITY,
+            )
+            workload = self.workload_cache.get(key, generate)
+
+        if not self.legacy_workload:
+            seed(seed_num)
+        elif job_count > 0:
+            # The legacy generator leaves the random module in the state of its
+            # last job, which is reproduced even if the workload comes from the cache.
+            self._generate_job(0, server_count, job_count - 1, seed_num)
+        return workload
 
     def _generate_jobs(self, job_count, server_count, seed_num):
-        """Generates a set of jobs.
+        """Generates a set of jobs, reseeding the generators for each job.
 
         Args:
             job_count: The number of jobs to be generates.
@@ -145,3 +600,20 @@ class Experiments:
         mu = log(mass / disparity)
         sigma = sqrt(2 * (numpy.log(mass) - mu))
         return scipy.stats.lognorm.rvs(sigma, scale=mass / disparity)
+
+
+def _run_expt_task(task):
+    """Runs one experiment in a worker process.
+
+    Defined at the module level to be picklable by the process pool.
+
+    Args:
+        task: A tuple of the Experiments object, the SchedulerConfig, the servers \
+        count and the seed.
+
+    Returns:
+        tuple: The SchedulerStats and the RngState left by the experiment.
+    """
+    experiments, config, num_srvs, seed_num = task
+    stats = experiments._run_expt(config, num_srvs, seed_num)
+    return stats, RngState.capture()
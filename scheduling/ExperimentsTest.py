@@ -3,8 +3,12 @@ from pathlib import Path
 
 import pandas
 
+from .CostTable import CostTable
+from .EvaluationCache import EvaluationCache
 from .Experiments import Experiments
 from .Scheduler import SchedulerConfig
+from .Tracer import RingTracer, Tracer
+from .WorkloadCache import WorkloadCache
 
 logger = logging.getLogger(__name__)
 
@@ -25,21 +29,45 @@ def load_best_config(seed, path=None):
 
 def run_all_experiments(visualizer, config):
     seed = config["SEED"]
+    gantt_format = config.get("gantt_format", "png")
     output_dir = f"./results/benchmarking_experiments/seed_{seed}"
+    # All the benchmarks run on the same workloads.
+    workload_cache = WorkloadCache(directory=config.get("workload_cache_dir"))
+    evaluation_cache = (
+        EvaluationCache(directory=config.get("evaluation_cache_dir"))
+        if config.get("cache_evaluations")
+        else None
+    )
 
     def run_experiments(expt_name, scheduler_config, **kwargs):
-        experiment = Experiments(**kwargs)
-        stats = experiment.run_expts(
-            config=scheduler_config,
-            num_srvs=config["SERVER_COUNT"],
-            num_expts=config["EXPTS_COUNT"],
-            seed_num=config["SEED"],
-        )
+        with Experiments(
+            num_workers=config.get("workers", 1),
+            legacy_workload=config.get("legacy_workload", False),
+            workload_cache=workload_cache,
+            evaluation_cache=evaluation_cache,
+            instrument=config.get("instrument", False),
+            batch=config.get("batch", False),
+            tracer=Tracer.from_option(config.get("trace")),
+            **kwargs,
+        ) as experiment:
+            stats = experiment.run_expts(
+                config=scheduler_config,
+                num_srvs=config["SERVER_COUNT"],
+                num_expts=config["EXPTS_COUNT"],
+                seed_num=config["SEED"],
+            )
 
-        if config["draw_experiment_gantt"]:
+        # Experiments simulated in lockstep do not record their schedules.
+        recorded = all(stat.segments is not None for stat in stats)
+        if config["draw_experiment_gantt"] and recorded:
             for i, stat in enumerate(stats):
                 visualizer.draw_gantt(
-                    stat, f"{output_dir}/{expt_name}/experiment_{i}.png"
+                    stat, f"{output_dir}/{expt_name}/experiment_{i}.{gantt_format}"
+                )
+        if config.get("save_experiment_traces") and recorded:
+            for i, stat in enumerate(stats):
+                visualizer.to_trace(
+                    stat, f"{output_dir}/{expt_name}/experiment_{i}.trace"
                 )
         if config["draw_experiment_cost"]:
             df_stats = pandas.DataFrame([stat.to_dict() for stat in stats])
@@ -51,6 +79,22 @@ def run_all_experiments(visualizer, config):
             [stat.to_dict() for stat in stats],
             f"{output_dir}/{expt_name}/{expt_name}.csv",
         )
+        if config.get("rescore_weights"):
+            weights = config["rescore_weights"]
+            visualizer.to_csv(
+                CostTable.from_stats(stats).grid(weights, weights),
+                f"{output_dir}/{expt_name}/{expt_name}_weights.csv",
+            )
+        if config.get("instrument"):
+            visualizer.to_csv(
+                [stat.instrumentation.to_dict() for stat in stats],
+                f"{output_dir}/{expt_name}/{expt_name}_instrumentation.csv",
+            )
+        if isinstance(experiment.tracer, RingTracer):
+            visualizer.to_csv(
+                experiment.tracer.to_frame(),
+                f"{output_dir}/{expt_name}/{expt_name}_trace_events.csv",
+            )
         logger.debug("Done.")
 
     # Reconfigurations and Power-offs take place whenever possible.-------------
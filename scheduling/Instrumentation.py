@@ -0,0 +1,85 @@
+from dataclasses import asdict, dataclass
+
+import pandas
+
+
+@dataclass
+class Instrumentation:
+    """A container for the counters of the phases of a simulation.
+
+    An update of the schedule has four phases: retiring the complete jobs,
+    starting the queued JobRequests in FIFO order, reconfiguring the running
+    jobs and powering off the idle servers. The Scheduler only fills the
+    counters when it is given an Instrumentation object.
+    """
+
+    update_count: int = 0  #: The count of updates of the schedule.
+    complete_time: float = 0  #: The time spent retiring the complete jobs.
+    schedule_time: float = 0  #: The time spent starting the queued JobRequests.
+    reconfigure_time: float = 0  #: The time spent reconfiguring the running jobs.
+    power_off_time: float = 0  #: The time spent powering off the idle servers.
+    completed_count: int = 0  #: The count of jobs retired at their ending time.
+    scheduled_count: int = 0  #: The count of JobRequests started.
+    reconfig_evaluated: int = 0  #: The count of reconfiguration decisions taken.
+    reconfig_accepted: int = 0  #: The count of reconfigurations decided.
+    shutdown_evaluated: int = 0  #: The count of shutdown decisions taken.
+    shutdown_accepted: int = 0  #: The count of power-offs decided.
+    queue_length_total: int = 0
+    """The sum of the lengths of the queue at the start of the updates."""
+    queue_length_max: int = 0  #: The maximum length of the queue at an update.
+    free_servers_total: int = 0
+    """The sum of the counts of free servers at the start of the updates."""
+    free_servers_max: int = 0  #: The maximum count of free servers at an update.
+    simulate_time: float = 0  #: The time spent in the whole simulation loop.
+    event_batch_count: int = 0  #: The count of instants processed by the loop.
+    arrival_count: int = 0  #: The count of JobRequests submitted by the loop.
+
+    @property
+    def update_time(self):
+        """float: The time spent in the four phases of the updates."""
+        return (
+            self.complete_time
+            + self.schedule_time
+            + self.reconfigure_time
+            + self.power_off_time
+        )
+
+    def observe(self, queue_length: int, free_server_count: int):
+        """Counts an update of the schedule and samples the state of the cluster.
+
+        Args:
+            queue_length: The count of queued JobRequests.
+            free_server_count: The count of servers running no job.
+        """
+        self.update_count += 1
+        self.queue_length_total += queue_length
+        self.queue_length_max = max(self.queue_length_max, queue_length)
+        self.free_servers_total += free_server_count
+        self.free_servers_max = max(self.free_servers_max, free_server_count)
+
+    def to_dict(self):
+        """Converts the counters into a dictionary, along with derived measures.
+
+        Returns:
+            dict: The counters, the total update time and the mean queue length \
+            and count of free servers at an update.
+        """
+        update_count = max(self.update_count, 1)
+        return {
+            **asdict(self),
+            "update_time": self.update_time,
+            "mean_queue_length": self.queue_length_total / update_count,
+            "mean_free_servers": self.free_servers_total / update_count,
+        }
+
+    @staticmethod
+    def to_frame(stats: list):
+        """Gathers the counters of several experiments in a DataFrame.
+
+        Args:
+            stats: A list of SchedulerStats objects of instrumented experiments.
+
+        Returns:
+            pandas.DataFrame: A DataFrame with one row per experiment.
+        """
+        return pandas.DataFrame([stat.instrumentation.to_dict() for stat in stats])
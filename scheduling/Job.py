@@ -7,6 +7,18 @@ class Job:
 
     POWER_OFF_ID = "POWER_OFF"  #: An identifier for power off jobs.
 
+    __slots__ = (
+        "id",
+        "alpha",
+        "data",
+        "mass",
+        "max_server_count",
+        "servers",
+        "server_count",
+        "start_time",
+        "end_time",
+    )
+
     def __init__(
         self,
         req_id: str,
@@ -0,0 +1,163 @@
+from dataclasses import fields
+from math import inf
+from random import randrange
+
+import numpy
+import pandas
+
+from .Scheduler import SchedulerConfig
+
+
+class ParetoArchive:
+    """A set of non-dominated SchedulerConfigs over the objectives of the cost.
+
+    A configuration is kept as long as no other evaluated configuration is at
+    least as good on both the mean stretch time and the average normalized
+    power. Beyond ``max_size`` configurations, the most crowded one, i.e. the
+    one of smallest crowding distance, is dropped, which keeps the front spread.
+    The objectives of the configurations are only comparable if they were
+    measured on the same workloads.
+    """
+
+    OBJECTIVES = ("mean_stretch_time", "average_power_norm")
+    """The minimized objectives, whose weighted product is the cost."""
+
+    def __init__(self, max_size=100):
+        """Creates a ParetoArchive object.
+
+        Args:
+            max_size: The maximum count of configurations kept.
+        """
+        self.max_size = max_size  #: The maximum count of configurations kept.
+        self.positions = numpy.empty((0, len(fields(SchedulerConfig))))
+        """numpy.array: The configurations of the front, by row."""
+        self.objectives = numpy.empty((0, len(self.OBJECTIVES)))
+        """numpy.array: The objectives of each configuration, by row."""
+        self.epochs = numpy.empty(0, int)
+        """numpy.array: The epoch in which each configuration was evaluated."""
+
+    def __len__(self):
+        return len(self.objectives)
+
+    def add(self, position, objectives, epoch: int):
+        """Adds an evaluated configuration if it is not dominated.
+
+        The configurations it dominates are removed.
+
+        Args:
+            position: The values of the SchedulerConfig.
+            objectives: The value of each of the OBJECTIVES.
+            epoch: The epoch in which the configuration was evaluated.
+
+        Returns:
+            bool: True if the configuration joined the front.
+        """
+        objectives = numpy.asarray(objectives, dtype=float)
+        if numpy.all(self.objectives <= objectives, axis=1).any():
+            return False
+
+        kept = ~numpy.all(objectives <= self.objectives, axis=1)
+        self.positions = numpy.vstack((self.positions[kept], position))
+        self.objectives = numpy.vstack((self.objectives[kept], objectives))
+        self.epochs = numpy.append(self.epochs[kept], epoch)
+        while len(self) > self.max_size:
+            self._remove(numpy.argmin(self.crowding_distances()))
+        return True
+
+    @staticmethod
+    def non_dominated(objectives):
+        """Finds the rows of objectives that no other row dominates.
+
+        Of identical rows, only the first one is non-dominated, as add keeps
+        the first configuration reaching a point of the front.
+
+        Args:
+            objectives: The value of each of the OBJECTIVES, by row.
+
+        Returns:
+            numpy.array: A mask of the non-dominated rows.
+        """
+        objectives = numpy.asarray(objectives, dtype=float).reshape(-1, 2)
+        # Whether the row of the column is at least as good as the row of the
+        # line, respectively strictly better on one objective.
+        at_least = numpy.all(objectives[None, :] <= objectives[:, None], axis=2)
+        better = numpy.any(objectives[None, :] < objectives[:, None], axis=2)
+        earlier = numpy.tri(len(objectives), k=-1, dtype=bool)
+        return ~numpy.any(at_least & (better | earlier), axis=1)
+
+    def crowding_distances(self):
+        """Computes how isolated each configuration is on the front.
+
+        Returns:
+            numpy.array: The sum over the objectives of the normalized gap \
+            between the neighbours of each configuration, inf at the extremes.
+        """
+        count = len(self)
+        distances = numpy.zeros(count)
+        if count == 0:
+            return distances
+        for column in self.objectives.T:
+            order = numpy.argsort(column, kind="stable")
+            span = column[order[-1]] - column[order[0]]
+            distances[order[[0, -1]]] = inf
+            if count > 2 and span > 0:
+                gaps = column[order[2:]] - column[order[:-2]]
+                distances[order[1:-1]] += gaps / span
+        return distances
+
+    def select_leaders(self, count: int):
+        """Draws guides of the Particles from the front, favoring sparse regions.
+
+        Each leader is the less crowded of two configurations drawn from the
+        random module, i.e. a binary tournament on the crowding distance.
+
+        Args:
+            count: The count of leaders to draw.
+
+        Returns:
+            numpy.array: The positions of the leaders, by row.
+        """
+        distances = self.crowding_distances()
+        leaders = []
+        for _ in range(count):
+            first, second = randrange(len(self)), randrange(len(self))
+            leaders.append(first if distances[first] >= distances[second] else second)
+        return self.positions[leaders]
+
+    def best_config(self, stretch_time_weight: float, energy_weight: float):
+        """Picks the configuration of the front best suited to a weighting.
+
+        Args:
+            stretch_time_weight: The exponent weight of the mean stretch time.
+            energy_weight: The exponent weight of the average normalized power.
+
+        Returns:
+            SchedulerConfig: The configuration of lowest weighted product of \
+            its objectives.
+        """
+        costs = (
+            self.objectives[:, 0] ** stretch_time_weight
+            * self.objectives[:, 1] ** energy_weight
+        )
+        return SchedulerConfig(*self.positions[numpy.argmin(costs)].tolist())
+
+    def to_frame(self):
+        """Converts the front into a DataFrame.
+
+        Returns:
+            pandas.DataFrame: One row per configuration, sorted by mean stretch \
+            time, with the configuration fields, the objectives and the epoch.
+        """
+        frame = pandas.DataFrame(
+            self.positions, columns=[field.name for field in fields(SchedulerConfig)]
+        )
+        for name, column in zip(self.OBJECTIVES, self.objectives.T):
+            frame[name] = column
+        frame["epoch"] = self.epochs
+        return frame.sort_values(list(self.OBJECTIVES), ignore_index=True)
+
+    def _remove(self, index: int):
+        kept = numpy.arange(len(self)) != index
+        self.positions = self.positions[kept]
+        self.objectives = self.objectives[kept]
+        self.epochs = self.epochs[kept]
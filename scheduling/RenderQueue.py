@@ -0,0 +1,143 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import structlog
+
+from .SegmentTable import SegmentTable
+from .Visualizer import Visualizer
+
+
+class RenderQueue:
+    """A bounded queue of Visualizer jobs drained by a pool of processes.
+
+    The queue exposes the outputs of the Visualizer, which are written in the
+    background while the simulation goes on. When ``max_pending`` jobs are
+    waiting, submitting blocks until one of them is done, or, for the Gantt
+    charts and if ``drop_late`` is set, the new chart is dropped. The colors of
+    the Gantt charts are drawn by the submitting process, so the random state
+    of the simulation does not depend on the rendering. With no workers, the
+    jobs run immediately in the submitting process.
+    """
+
+    def __init__(
+        self, visualizer: Visualizer, num_workers=1, max_pending=8, drop_late=False
+    ):
+        """Creates a RenderQueue object.
+
+        Args:
+            visualizer: The Visualizer writing the outputs.
+            num_workers: The count of rendering processes, the jobs are run \
+            immediately if 0.
+            max_pending: The maximum count of jobs submitted but not done.
+            drop_late: A flag for dropping the Gantt charts submitted while the \
+            queue is full instead of waiting.
+        """
+        self.visualizer = visualizer  #: Visualizer: The writer of the outputs.
+        self.num_workers = num_workers  #: The count of rendering processes.
+        self.max_pending = max_pending
+        """The maximum count of jobs submitted but not done."""
+        self.drop_late = drop_late
+        """A flag for dropping the Gantt charts submitted while the queue is full."""
+        self.dropped = 0  #: The count of dropped Gantt charts.
+        self.logger = structlog.getLogger(__name__)  #: The RenderQueue's logger.
+        self._executor = (
+            ProcessPoolExecutor(max_workers=num_workers) if num_workers > 0 else None
+        )
+        self._pending = set()  #: The futures of the jobs submitted but not done.
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def draw_gantt(self, stats, filepath: str):
+        """Queues a Gantt chart, see Visualizer.draw_gantt.
+
+        Args:
+            stats: A SchedulerStats object or the SegmentTable of a schedule.
+            filepath (str): The location for writing the resulting Gantt chart.
+        """
+        segments = stats if isinstance(stats, SegmentTable) else stats.segments
+        colors = self.visualizer.gantt_colors(segments)
+        self._submit("draw_gantt", segments, filepath, colors, droppable=True)
+
+    def draw_graph(self, stats, filepath: str, show_range=False):
+        """Queues a cost graph, see Visualizer.draw_graph.
+
+        Args:
+            stats: A container object for the epoch's or experiment's statistics.
+            filepath: Location for writing the resulting chart.
+            show_range: A flag for enabling showing the min-max range.
+        """
+        self._submit("draw_graph", stats, filepath, show_range)
+
+    def to_trace(self, stats, path: str):
+        """Queues a columnar trace, see Visualizer.to_trace.
+
+        Args:
+            stats (SchedulerStats): A container object for the scheduler's \
+            output statistics.
+            path (str): The directory for writing the trace.
+        """
+        self._submit("to_trace", stats, path)
+
+    def to_csv(self, table: list, path: str):
+        """Queues a csv file, see Visualizer.to_csv.
+
+        Args:
+            table (list): A python list.
+            path (str): The location for writing the csv file.
+        """
+        self._submit("to_csv", table, path)
+
+    def flush(self):
+        """Waits until all the submitted jobs are done.
+
+        Raises:
+            Exception: The first error raised by a job, if any.
+        """
+        done, _ = wait(self._pending)
+        self._pending = set()
+        for future in done:
+            future.result()
+
+    def close(self):
+        """Flushes the queue and stops the rendering processes.
+        """
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            if self.dropped:
+                self.logger.warning("dropped late renders", count=self.dropped)
+
+    def _submit(self, method: str, *args, droppable=False):
+        # Runs the Visualizer method in the pool, waiting for a slot if full.
+        if self._executor is None:
+            getattr(self.visualizer, method)(*args)
+            return
+
+        self._collect(block=False)
+        if len(self._pending) >= self.max_pending:
+            if droppable and self.drop_late:
+                self.dropped += 1
+                return
+            self._collect(block=True)
+        future = self._executor.submit(getattr(self.visualizer, method), *args)
+        self._pending.add(future)
+
+    def _collect(self, block: bool):
+        # Forgets the done jobs, waiting for at least one if block, and raises
+        # their errors.
+        if not self._pending:
+            return
+        done, self._pending = wait(
+            self._pending, timeout=None if block else 0, return_when=FIRST_COMPLETED
+        )
+        for future in done:
+            future.result()
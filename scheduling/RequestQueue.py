@@ -0,0 +1,57 @@
+import heapq
+from itertools import count
+
+from .JobRequest import JobRequest
+
+
+class RequestQueue:
+    """A priority queue of JobRequests ordered by submission time.
+
+    Requests submitted at the same time are served in insertion order. The
+    queue keeps running aggregates of the requests it holds.
+    """
+
+    def __init__(self):
+        """Creates an empty RequestQueue object.
+        """
+        self.min_num_servers = 0
+        """The total minimum number of servers required by the queued requests."""
+        self._heap = []  #: The binary heap of (sub_time, sequence, JobRequest).
+        self._counter = count()  #: A generator of insertion sequence numbers.
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        return (req for _, _, req in sorted(self._heap))
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def push(self, job_request: JobRequest):
+        """Adds a JobRequest to the queue in O(log n).
+
+        Args:
+            job_request: The JobRequest object to be queued.
+        """
+        entry = (job_request.sub_time, next(self._counter), job_request)
+        heapq.heappush(self._heap, entry)
+        self.min_num_servers += job_request.min_num_servers
+
+    def peek(self):
+        """Gets the earliest submitted JobRequest without removing it, in O(1).
+
+        Returns:
+            JobRequest: The earliest submitted JobRequest object.
+        """
+        return self._heap[0][2]
+
+    def pop(self):
+        """Removes the earliest submitted JobRequest in O(log n).
+
+        Returns:
+            JobRequest: The earliest submitted JobRequest object.
+        """
+        _, _, job_request = heapq.heappop(self._heap)
+        self.min_num_servers -= job_request.min_num_servers
+        return job_request
@@ -0,0 +1,33 @@
+import random
+from dataclasses import dataclass
+
+import numpy
+
+
+@dataclass
+class RngState:
+    """A snapshot of the global random number generators.
+
+    The Scheduler draws its decisions from the global ``random`` module and the
+    job generator reseeds both ``random`` and ``numpy.random``. Capturing their
+    state after a run performed in another process allows the calling process to
+    continue exactly as if the run had been performed locally.
+    """
+
+    python_state: tuple  #: The state of the ``random`` module.
+    numpy_state: tuple  #: The state of the legacy ``numpy.random`` generator.
+
+    @classmethod
+    def capture(cls):
+        """Captures the current state of the global random number generators.
+
+        Returns:
+            RngState: An RngState object.
+        """
+        return cls(random.getstate(), numpy.random.get_state())
+
+    def restore(self):
+        """Restores the global random number generators to the captured state.
+        """
+        random.setstate(self.python_state)
+        numpy.random.set_state(self.numpy_state)
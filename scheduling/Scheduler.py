@@ -1,14 +1,23 @@
-from copy import deepcopy
+import heapq
 from dataclasses import astuple, dataclass
-from operator import attrgetter, methodcaller
+from itertools import count
+from math import nan
+from operator import methodcaller
 from random import random, sample, uniform
 from statistics import mean, stdev
+from time import perf_counter
 
-import structlog
+import numpy
 
+from .Event import EventQueue
+from .Instrumentation import Instrumentation
 from .Job import Job
 from .JobRequest import JobRequest
+from .RequestQueue import RequestQueue
+from .SegmentTable import SegmentTable
 from .Server import Server
+from .StatsAccumulator import StatsAccumulator
+from .Tracer import NULL_TRACER, Tracer, TraceKind
 
 
 @dataclass
@@ -67,7 +76,8 @@ class SchedulerStats:
     """A container for the output statistics of the scheduler.
     """
 
-    complete_jobs: dict  #: The list of the jobs that had been scheduled.
+    complete_jobs: dict
+    """The list of the jobs that had been scheduled, empty if they were not kept."""
     start_time: int  #: The starting time of the scheduler.
     end_time: int  #: The ending time of the scheduler.
     work_duration: int  #: The span of time during which the scheduling took place.
@@ -79,15 +89,22 @@ class SchedulerStats:
     stdev_stretch_time: float  #: The standard deviation of the stretch time.
     average_power_norm: float  #: The mean obtained normalized power.
     cost: float  #: The calculated cost resulting from the scheduling of jobs.
+    segments: SegmentTable = None
+    """SegmentTable: The completed jobs of the schedule as a table of segments."""
+    instrumentation: Instrumentation = None
+    """Instrumentation: The counters of the phases of the simulation, if enabled."""
 
     def to_dict(self):
         """Converts the attributes of a SchedulerStats object into a dictionary.
 
-        Discards the list of the completed jobs from the returned dictionary.
+        Discards the completed jobs, segments and instrumentation counters from \
+        the returned dictionary.
         """
-        dict_obj = deepcopy(self.__dict__)
-        dict_obj.pop("complete_jobs")
-        return dict_obj
+        return {
+            name: value
+            for name, value in self.__dict__.items()
+            if name not in ("complete_jobs", "segments", "instrumentation")
+        }
 
 
 class Scheduler(object):
@@ -101,6 +118,11 @@ class Scheduler(object):
         reconfig_enabled=True,
         power_off_enabled=True,
         param_enabled=True,
+        events: EventQueue = None,
+        keep_jobs=True,
+        tracer: Tracer = None,
+        keep_segments=True,
+        instrumentation: Instrumentation = None,
     ):
         """Creates a Scheduler object.
 
@@ -112,6 +134,17 @@ class Scheduler(object):
             param_enabled: A flag for enabling the decision taking process,\
             if False the scheduler will always reconfigure jobs, respectively \
             shut down idle servers.
+            events: The queue in which the ending events of the started jobs are \
+            posted. A new EventQueue is created if None.
+            keep_jobs: A flag for keeping the completed Job objects in \
+            complete_jobs. They are only recorded in the segments table if False.
+            tracer: The Tracer recording the scheduling events, nothing is \
+            recorded if None.
+            keep_segments: A flag for recording the schedule in the segments \
+            table. If False, the completed JobRequests are forgotten once their \
+            stretch time is accounted for, keeping the memory used constant.
+            instrumentation: The counters filled by the phases of the updates of \
+            the schedule, nothing is counted if None.
 
         """
         self.servers = [
@@ -125,14 +158,39 @@ class Scheduler(object):
         self.reconfig_enabled = reconfig_enabled
         """A flag for enabling reconfigurations."""
         self.power_off_enabled = power_off_enabled  #: A flag for enabling power-offs.
-        self.req_queue = []  #: The queue of the scheduler. Holds JobRequest objects.
+        self.req_queue = RequestQueue()
+        """RequestQueue: The queue of the scheduler. Holds JobRequest objects."""
         self.req_by_id = {}
         """A dictionary where the keys are the ids of the \
          JobRequests objects in the Scheduler's queue. Helps tracking a \
          splitten job due to one or several reconfigurations."""
-        self.active_jobs = []  #: A list of all running jobs.
+        self.free_servers = numpy.ones(server_count, dtype=bool)
+        """numpy.array: A mask of the servers running no job, by server index."""
+        self.busy_until = numpy.zeros(server_count)
+        """numpy.array: The end time of the last job of each server, by index."""
+        self._server_job_counts = numpy.zeros(server_count, dtype=int)
+        """numpy.array: The count of active jobs of each server, by index."""
+        self.active_jobs = {}
+        """A dictionary of all running jobs, mapped to their starting order. Keeps\
+        the jobs in starting order and removes them in O(1)."""
+        self._completions = []
+        """A binary heap of (end_time, starting order, Job) of the running jobs."""
+        self._start_counter = count()  #: A generator of starting orders.
+        self._working_job_count = 0  #: The count of running jobs but power-offs.
         self.complete_jobs = {}  #: A list of the completed jobs.
-        self.logger = structlog.getLogger(__name__)  #: The scheduler's logger.
+        self.keep_jobs = keep_jobs  #: A flag for keeping the completed Job objects.
+        self.keep_segments = keep_segments
+        """A flag for recording the schedule in the segments table."""
+        self.segments = SegmentTable(server_count)
+        """SegmentTable: The completed jobs as a compact table of segments."""
+        self.accumulator = StatsAccumulator()
+        """StatsAccumulator: The statistics of the completed jobs."""
+        self.events = EventQueue() if events is None else events
+        """EventQueue: The queue receiving the ending events of the started jobs."""
+        self.tracer = NULL_TRACER if tracer is None else tracer
+        """Tracer: The recorder of the scheduling events."""
+        self.instrumentation = instrumentation
+        """Instrumentation: The counters of the phases, None if disabled."""
 
     def is_working(self):
         """Checks whether the scheduler has finished scheduling.
@@ -140,9 +198,7 @@ class Scheduler(object):
         Returns:
             True if successful, False otherwise.
         """
-        return self.req_queue or (
-            self.active_jobs and not all(job.is_power_off() for job in self.active_jobs)
-        )
+        return self.req_queue or self._working_job_count > 0
 
     def stop(self, time):
         """Stops the scheduler at the indicated time.
@@ -151,9 +207,15 @@ class Scheduler(object):
             time: The time at which the scheduler stops working.
 
         """
-        for job in self.active_jobs:
+        jobs = list(self.active_jobs)
+        for job in jobs:
             job.end_time = time
-        self._remove_job(*self.active_jobs)
+        self._remove_job(*jobs)
+        self._completions.clear()
+        if not self.keep_segments:
+            for job_request in list(self.req_by_id.values()):
+                if job_request.id in self.accumulator.last_end_times:
+                    self._retire_request(job_request.id)
 
     def schedule(self, job_request: JobRequest):
         """Handles new upcoming JobRequests.
@@ -162,9 +224,10 @@ class Scheduler(object):
             job_request: The JobRequest object to be scheduled by the Scheduler.
 
         """
-        self.req_queue.append(job_request)
-        self.req_queue.sort(key=attrgetter("sub_time"), reverse=True)
+        self.req_queue.push(job_request)
         self.req_by_id[job_request.id] = job_request
+        if self.keep_segments:
+            self.segments.add_request(job_request)
 
     def update_schedule(self, time):
         """Updates the schedule at time t.
@@ -172,61 +235,149 @@ class Scheduler(object):
         Args:
             time: The time at which the schedule need to be updated.
         """
-        self._remove_job(*[job for job in self.active_jobs if job.is_complete(time)])
-
-        # Schedule jobs in the queue
-        av_servers = [server for server in self.servers if not server.is_busy(time)]
-        self.logger.debug(
-            "update_schedule",
-            time=time,
-            av_servers=av_servers,
-            req_queue=self.req_queue,
-        )
+        if self.instrumentation is not None:
+            self._update_schedule_instrumented(time)
+            return
+
+        self._complete_jobs(time)
+        av_servers = self._schedule_jobs(time)
+        if self.reconfig_enabled:
+            av_servers = self._reconfigure_jobs(av_servers, time)
+        if self.power_off_enabled:
+            self._power_off_servers(av_servers, time)
+
+    def _update_schedule_instrumented(self, time):
+        # The phases of update_schedule, timed.
+        instrumentation = self.instrumentation
+        clock = perf_counter()
+        self._complete_jobs(time)
+        instrumentation.observe(len(self.req_queue), int(self.free_servers.sum()))
+        now = perf_counter()
+        instrumentation.complete_time += now - clock
+        clock = now
+
+        av_servers = self._schedule_jobs(time)
+        now = perf_counter()
+        instrumentation.schedule_time += now - clock
+        clock = now
+
+        if self.reconfig_enabled:
+            av_servers = self._reconfigure_jobs(av_servers, time)
+            now = perf_counter()
+            instrumentation.reconfigure_time += now - clock
+            clock = now
+
+        if self.power_off_enabled:
+            self._power_off_servers(av_servers, time)
+            instrumentation.power_off_time += perf_counter() - clock
+
+    def _complete_jobs(self, time):
+        # Retires the jobs complete at time t.
+        complete_jobs = self._pop_complete_jobs(time)
+        self._remove_job(*complete_jobs)
+        if self.instrumentation is not None:
+            self.instrumentation.completed_count += len(complete_jobs)
+        if not self.keep_segments:
+            # A job completing without interruption is the last one of its request.
+            for job in complete_jobs:
+                if job.mass > 0:
+                    self._retire_request(job.id)
+
+    def _schedule_jobs(self, time):
+        # Starts the queued requests in FIFO order and returns the servers left.
+        av_servers = self._available_servers()
+        if self.tracer.enabled:
+            self.tracer.record(
+                TraceKind.UPDATE,
+                time,
+                server_count=len(av_servers),
+                active_count=len(self.active_jobs),
+                queue_length=len(self.req_queue),
+            )
         # Priotitize FIFO scheduling as long as there are jobs in the queue
         while self.req_queue and av_servers:
-            job_req = self.req_queue[-1]
+            job_req = self.req_queue.peek()
             job_servers = self._allocate_servers(av_servers, job_req)
             if not job_servers:
                 break
-            self.logger.debug("schedule job req", time=time, req=job_req)
+            if self.tracer.enabled:
+                self.tracer.record(
+                    TraceKind.SCHEDULE,
+                    time,
+                    request=job_req.id,
+                    server_count=len(job_servers),
+                    queue_length=len(self.req_queue),
+                )
             job = Job.from_request(job_req, job_servers, start_time=time)
             self._start_job(job)
             self.req_queue.pop()
-            av_servers = [server for server in av_servers if server not in job_servers]
-
-        # Applies a reconfiguration
-        if self.reconfig_enabled:
-            jobs_by_mass = sorted(
-                self.active_jobs, key=methodcaller("remaining_mass", time)
-            )
-            while jobs_by_mass and av_servers:
-                job = jobs_by_mass[0]
-                if self._is_job_reconfigurable(job, av_servers, time):
-                    av_servers = self._reconfigure_job(job, av_servers, time)
-                jobs_by_mass.pop(0)
+            if self.instrumentation is not None:
+                self.instrumentation.scheduled_count += 1
+            av_servers = self._available_servers()
+        return av_servers
 
-        # Applies power-offs
-        if self.power_off_enabled:
-            for server in list(av_servers):
-                if not self._shutdown_server(av_servers):
-                    break
+    def _reconfigure_jobs(self, av_servers: list, time):
+        # Applies reconfigurations, smallest remaining mass first, and returns
+        # the servers left.
+        # Jobs that are not reconfigurable would be skipped anyway.
+        jobs_by_mass = sorted(
+            filter(methodcaller("is_reconfigurable"), self.active_jobs),
+            key=methodcaller("remaining_mass", time),
+        )
+        instrumentation = self.instrumentation
+        for job in jobs_by_mass:
+            if not av_servers:
+                break
+            reconfigurable = self._is_job_reconfigurable(job, av_servers, time)
+            if instrumentation is not None:
+                instrumentation.reconfig_evaluated += 1
+                instrumentation.reconfig_accepted += reconfigurable
+            if reconfigurable:
+                av_servers = self._reconfigure_job(job, av_servers, time)
+        return av_servers
 
-                shutdown, duration = self._allow_shutdown(av_servers)
-                if not shutdown:
-                    continue
+    def _power_off_servers(self, av_servers: list, time):
+        # Applies power-offs to the available servers.
+        av_count = len(av_servers)
+        instrumentation = self.instrumentation
+        for server in av_servers:
+            if not self._shutdown_server(av_count):
+                break
 
-                power_off = Job.make_power_off(
-                    [server], start_time=time, duration=duration
-                )
-                self._start_job(power_off)
-                av_servers.remove(server)
+            shutdown, duration = self._allow_shutdown(av_count)
+            if instrumentation is not None:
+                instrumentation.shutdown_evaluated += 1
+                instrumentation.shutdown_accepted += shutdown
+            if not shutdown:
+                # The decision only depends on the count of available servers,
+                # it would be the same for the remaining ones.
+                break
 
-    def _allow_shutdown(self, av_servers: list):
+            power_off = Job.make_power_off([server], start_time=time, duration=duration)
+            self._start_job(power_off)
+            av_count -= 1
+
+    def _pop_complete_jobs(self, time):
+        # Pops the jobs complete at time t from the heap, in starting order.
+        # Entries of jobs already removed, i.e. interrupted, are discarded.
+        complete = []
+        while self._completions and self._completions[0][0] <= time:
+            _, start_order, job = heapq.heappop(self._completions)
+            if self.active_jobs.get(job) == start_order and job.is_complete(time):
+                complete.append((start_order, job))
+        complete.sort(key=lambda entry: entry[0])
+        return [job for _, job in complete]
+
+    def _available_servers(self):
+        # The servers running no job, in index order.
+        return [self.servers[i] for i in numpy.flatnonzero(self.free_servers)]
+
+    def _allow_shutdown(self, av_count: int):
         # Shutdown decision process
         if self.param_enabled:
             if (
                 0.5
-                > ((len(av_servers) / len(self.servers)) ** self.conf.shutdown_weight)
+                > ((av_count / len(self.servers)) ** self.conf.shutdown_weight)
                 * self.conf.shutdown_scale
             ):
                 return False, 0
@@ -242,39 +393,75 @@ class Scheduler(object):
 
     def _start_job(self, *jobs):
         for job in jobs:
-            self.active_jobs.append(job)
-            self.logger.debug(
-                "new job", server_count=len(job.servers), active_jobs=self.active_jobs
-            )
+            start_order = next(self._start_counter)
+            self.active_jobs[job] = start_order
+            heapq.heappush(self._completions, (job.end_time, start_order, job))
+            if not job.is_power_off():
+                self._working_job_count += 1
+            self.events.push_job_end(job)
+            if self.tracer.enabled:
+                self._trace_job(TraceKind.START, job.start_time, job)
             for server in job.servers:
                 server.add_job(job)
 
+            indexes = [server.index for server in job.servers]
+            self._server_job_counts[indexes] += 1
+            self.free_servers[indexes] = False
+            self.busy_until[indexes] = numpy.maximum(
+                self.busy_until[indexes], job.end_time
+            )
+
+    def _trace_job(self, kind: TraceKind, time, job: Job):
+        self.tracer.record(
+            kind,
+            time,
+            request=job.id,
+            server_count=len(job.servers),
+            active_count=len(self.active_jobs),
+            queue_length=len(self.req_queue),
+        )
+
     def _remove_job(self, *jobs):
         for job in jobs:
-            self.active_jobs.remove(job)
-            self.logger.debug(f"remove job", job=job, active_jobs=self.active_jobs)
+            del self.active_jobs[job]
+            if not job.is_power_off():
+                self._working_job_count -= 1
+            if self.tracer.enabled:
+                self._trace_job(TraceKind.REMOVE, job.end_time, job)
             for server in job.servers:
                 server.remove_job(job)
 
-            completed_jobs = self.complete_jobs.get(job.id, [])
-            completed_jobs.append(job)
-            self.complete_jobs[job.id] = completed_jobs
+            indexes = numpy.array([server.index for server in job.servers], dtype=int)
+            self._server_job_counts[indexes] -= 1
+            idle = indexes[self._server_job_counts[indexes] == 0]
+            self.free_servers[idle] = True
+            # An interrupted job no longer keeps its servers busy until its former end.
+            self.busy_until[idle] = job.end_time
+
+            self.accumulator.add(job)
+            if self.keep_segments:
+                self.segments.add(job)
+            if self.keep_jobs:
+                completed_jobs = self.complete_jobs.get(job.id, [])
+                completed_jobs.append(job)
+                self.complete_jobs[job.id] = completed_jobs
+
+    def _retire_request(self, req_id: str):
+        self.accumulator.retire(self.req_by_id.pop(req_id))
 
     def _reconfigure_job(self, job: Job, av_servers: list, time):
         job.interupt(time)
         extra_srv_count = min(job.max_server_count - job.server_count, len(av_servers))
         extra_srvs = sample(av_servers, extra_srv_count)
         job_servers = job.servers + extra_srvs
-        av_servers = [server for server in av_servers if server not in extra_srvs]
 
-        self.logger.debug(
-            "reconfigure job", time=time, job=job, server_count=len(job_servers)
-        )
+        if self.tracer.enabled:
+            self._trace_job(TraceKind.RECONFIGURE, time, job)
         reconfig_job, job_rest = job.reconfigure(job_servers, time)
         self._remove_job(job)
         self._start_job(reconfig_job, job_rest)
 
-        return av_servers
+        return self._available_servers()
 
     def _is_job_reconfigurable(self, job: Job, av_servers: list, time):
         if not job.is_reconfigurable():
@@ -295,12 +482,11 @@ class Scheduler(object):
         else:
             return extra_srv_count > 0
 
-    def _shutdown_server(self, av_servers: list):
+    def _shutdown_server(self, av_count: int):
         if not self.req_queue:
             return True
 
-        required_servers = sum(req.min_num_servers for req in self.req_queue)
-        return len(av_servers) > required_servers
+        return av_count > self.req_queue.min_num_servers
 
     def _allocate_servers(self, available_servers: list, job_req: JobRequest):
         min_servers = min(job_req.max_num_servers, len(available_servers))
@@ -323,77 +509,52 @@ class Scheduler(object):
             SchedulerStats: A SchedulerStats object is returned.
 
         """
-        stretch_times = self._stretch_times()
-        start_time, end_time = self._work_span()
+        if self.keep_segments:
+            stretch_times = self._stretch_times()
+            min_stretch_time = min(stretch_times)
+            max_stretch_time = max(stretch_times)
+            mean_stretch_time = mean(stretch_times)
+            # Undefined for a single request, as in the accumulator.
+            stdev_stretch_time = (
+                stdev(stretch_times) if len(stretch_times) > 1 else nan
+            )
+        else:
+            min_stretch_time = self.accumulator.min_stretch_time
+            max_stretch_time = self.accumulator.max_stretch_time
+            mean_stretch_time = self.accumulator.mean_stretch_time
+            stdev_stretch_time = self.accumulator.stdev_stretch_time
+        average_power_norm = self.accumulator.normalized_average_power(
+            len(self.servers)
+        )
         return SchedulerStats(
             complete_jobs=self.complete_jobs,
-            start_time=start_time,
-            end_time=end_time,
-            work_duration=self._work_duration(),
-            reconfig_count=self._num_reconfig_job(),
-            power_off_count=self._num_power_off(),
-            min_stretch_time=min(stretch_times),
-            max_stretch_time=max(stretch_times),
-            mean_stretch_time=mean(stretch_times),
-            stdev_stretch_time=stdev(stretch_times),
-            average_power_norm=self._normalized_average_power(),
-            cost=self._cost_function(stretch_times, stretch_time_weight, energy_weight),
+            start_time=self.accumulator.start_time,
+            end_time=self.accumulator.end_time,
+            work_duration=self.accumulator.work_duration,
+            reconfig_count=self.accumulator.reconfig_count,
+            power_off_count=self.accumulator.power_off_count,
+            min_stretch_time=min_stretch_time,
+            max_stretch_time=max_stretch_time,
+            mean_stretch_time=mean_stretch_time,
+            stdev_stretch_time=stdev_stretch_time,
+            average_power_norm=average_power_norm,
+            cost=self._cost_function(
+                mean_stretch_time,
+                average_power_norm,
+                stretch_time_weight,
+                energy_weight,
+            ),
+            segments=self.segments.compact() if self.keep_segments else None,
+            instrumentation=self.instrumentation,
         )
 
-    def _work_span(self):
-        jobs = [job for jobs_by_id in self.complete_jobs.values() for job in jobs_by_id]
-        first = min(jobs, key=attrgetter("start_time"))
-        last = max(jobs, key=attrgetter("end_time"))
-        return first.start_time, last.end_time
-
-    def _work_duration(self):
-        jobs = [job for jobs_by_id in self.complete_jobs.values() for job in jobs_by_id]
-        first = min(jobs, key=attrgetter("start_time"))
-        last = max(jobs, key=attrgetter("end_time"))
-        return last.end_time - first.start_time
-
     def _stretch_times(self):
-        def stretch_time(job_req):
-            last = self.complete_jobs[job_req.id][-1]
-            return (last.end_time - job_req.sub_time) / job_req.mass
-
-        return [stretch_time(j) for j in self.req_by_id.values()]
-
-    def _normalized_average_power(self):
-        def average_power(work_duration):
-            jobs = [
-                job for jobs_by_id in self.complete_jobs.values() for job in jobs_by_id
-            ]
-            total_energy = 0
-            area = 0
-            for job in jobs:
-                srv_count = len(job.servers)
-                if job.is_power_off():
-                    total_energy += Server.Consumption.reboot(job.duration) * srv_count
-                else:
-                    total_energy += Server.Consumption.active(job.duration) * srv_count
-                area += job.duration * srv_count
-            # adding idle time
-            energy_idle = Server.Consumption.idle(
-                work_duration * len(self.servers) - area
-            )
-            return total_energy + energy_idle
+        return [self.accumulator.stretch_time(j) for j in self.req_by_id.values()]
 
-        work_duration = self._work_duration()
-        idle_power = Server.Consumption.idle(work_duration) * len(self.servers)
-        return average_power(work_duration) / idle_power
-
-    def _num_reconfig_job(self):
-        return sum(
-            sum(job.is_reconfiguration() for job in jobs)
-            for jobs in self.complete_jobs.values()
-        )
-
-    def _num_power_off(self):
-        return len(self.complete_jobs.get(Job.POWER_OFF_ID, []))
-
-    def _cost_function(self, stretch_times, stretch_time_weight, energy_weight):
+    def _cost_function(
+        self, mean_stretch_time, average_power_norm, stretch_time_weight, energy_weight
+    ):
         return (
-            mean(stretch_times) ** stretch_time_weight
-            * self._normalized_average_power() ** energy_weight
+            mean_stretch_time ** stretch_time_weight
+            * average_power_norm ** energy_weight
         )
@@ -0,0 +1,337 @@
+import json
+from enum import IntEnum
+from pathlib import Path
+
+import numpy
+
+from .Job import Job
+from .Server import Server
+
+
+class SegmentKind(IntEnum):
+    """The kinds of job segments of a schedule.
+    """
+
+    JOB = 0  #: A segment computing (part of) the mass of a JobRequest.
+    RECONFIGURATION = 1  #: A segment transferring data between servers.
+    POWER_OFF = 2  #: A segment during which servers are rebooting.
+
+    @classmethod
+    def from_job(cls, job: Job):
+        """Finds the kind of segment a Job represents.
+
+        Args:
+            job: The completed Job.
+
+        Returns:
+            SegmentKind: The kind of the segment.
+        """
+        if job.is_power_off():
+            return cls.POWER_OFF
+        if job.is_reconfiguration():
+            return cls.RECONFIGURATION
+        return cls.JOB
+
+
+class SegmentTable:
+    """A struct-of-arrays representation of the completed jobs of a schedule.
+
+    Each row is a job segment, in retirement order. The servers of the segment i
+    are ``server_indices[server_offsets[i]:server_offsets[i + 1]]``. The
+    JobRequests are stored in a second table, in submission order, and segments
+    refer to them by their row index (-1 for power-offs).
+    """
+
+    SEGMENT_COLUMNS = {
+        "request": numpy.int32,
+        "kind": numpy.int8,
+        "start": numpy.float64,
+        "end": numpy.float64,
+        "mass": numpy.float64,
+        "alpha": numpy.float64,
+        "data": numpy.float64,
+    }  #: The data type of each per-segment column.
+    REQUEST_COLUMNS = {
+        "sub_time": numpy.float64,
+        "req_mass": numpy.float64,
+    }  #: The data type of each per-request column.
+
+    def __init__(self, cluster_size=0, capacity=64):
+        """Creates an empty SegmentTable object.
+
+        Args:
+            cluster_size: The total number of servers of the cluster.
+            capacity: The initial number of rows allocated for each table, the \
+            arrays double their size whenever they are full.
+        """
+        self.cluster_size = cluster_size  #: The total number of servers.
+        self.size = 0  #: The count of segments.
+        self.request_count = 0  #: The count of JobRequests.
+        self.request_ids = []  #: The JobRequest identifiers, by request row.
+        self._request_rows = {}  #: The request row of each JobRequest identifier.
+        self._columns = {
+            name: numpy.empty(capacity, dtype)
+            for name, dtype in {**self.SEGMENT_COLUMNS, **self.REQUEST_COLUMNS}.items()
+        }
+        self._server_offsets = numpy.zeros(capacity + 1, numpy.int64)
+        self._server_indices = numpy.empty(capacity, numpy.int32)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def request(self):
+        """numpy.array: The request row of each segment, -1 for power-offs."""
+        return self._columns["request"][: self.size]
+
+    @property
+    def kind(self):
+        """numpy.array: The SegmentKind of each segment."""
+        return self._columns["kind"][: self.size]
+
+    @property
+    def start(self):
+        """numpy.array: The starting time of each segment."""
+        return self._columns["start"][: self.size]
+
+    @property
+    def end(self):
+        """numpy.array: The ending time of each segment."""
+        return self._columns["end"][: self.size]
+
+    @property
+    def mass(self):
+        """numpy.array: The amount of calculations of each segment."""
+        return self._columns["mass"][: self.size]
+
+    @property
+    def alpha(self):
+        """numpy.array: The speedup factor alpha of each segment."""
+        return self._columns["alpha"][: self.size]
+
+    @property
+    def data(self):
+        """numpy.array: The amount of data of each segment."""
+        return self._columns["data"][: self.size]
+
+    @property
+    def sub_time(self):
+        """numpy.array: The submission time of each JobRequest."""
+        return self._columns["sub_time"][: self.request_count]
+
+    @property
+    def req_mass(self):
+        """numpy.array: The total amount of calculations of each JobRequest."""
+        return self._columns["req_mass"][: self.request_count]
+
+    @property
+    def server_offsets(self):
+        """numpy.array: The offsets of the servers of each segment, size + 1 long."""
+        return self._server_offsets[: self.size + 1]
+
+    @property
+    def server_indices(self):
+        """numpy.array: The concatenated server indices of all segments."""
+        return self._server_indices[: self._server_offsets[self.size]]
+
+    @property
+    def server_count(self):
+        """numpy.array: The number of servers of each segment."""
+        return numpy.diff(self.server_offsets)
+
+    @property
+    def duration(self):
+        """numpy.array: The duration of each segment."""
+        return self.end - self.start
+
+    def add_request(self, job_request):
+        """Appends a JobRequest to the requests table.
+
+        Args:
+            job_request: The JobRequest object submitted to the Scheduler.
+        """
+        row = self.request_count
+        self._reserve(row + 1, self.REQUEST_COLUMNS)
+        self._columns["sub_time"][row] = job_request.sub_time
+        self._columns["req_mass"][row] = job_request.mass
+        self._request_rows[job_request.id] = row
+        self.request_ids.append(job_request.id)
+        self.request_count += 1
+
+    def save(self, path):
+        """Writes the table as a columnar trace, one ``.npy`` file per column.
+
+        Directories referenced by path are created similar to mkdir -p.
+
+        Args:
+            path: The directory in which the trace is written.
+        """
+        path = Path(path)
+        path.mkdir(0o755, parents=True, exist_ok=True)
+        columns = {
+            **{name: getattr(self, name) for name in self.SEGMENT_COLUMNS},
+            **{name: getattr(self, name) for name in self.REQUEST_COLUMNS},
+            "server_offsets": self.server_offsets,
+            "server_indices": self.server_indices,
+            "request_ids": numpy.array(self.request_ids, dtype=str),
+        }
+        for name, column in columns.items():
+            numpy.save(path / f"{name}.npy", column)
+        meta = {
+            "cluster_size": self.cluster_size,
+            "size": self.size,
+            "request_count": self.request_count,
+        }
+        (path / "meta.json").write_text(json.dumps(meta))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Reads a columnar trace written by save.
+
+        Args:
+            path: The directory of the trace.
+            mmap: A flag for memory-mapping the columns instead of reading them.
+
+        Returns:
+            SegmentTable: A read-only SegmentTable object.
+        """
+        path = Path(path)
+        mmap_mode = "r" if mmap else None
+
+        def load_column(name):
+            return numpy.load(path / f"{name}.npy", mmap_mode=mmap_mode)
+
+        meta = json.loads((path / "meta.json").read_text())
+        table = cls(meta["cluster_size"], capacity=0)
+        table.size = meta["size"]
+        table.request_count = meta["request_count"]
+        for name in {**cls.SEGMENT_COLUMNS, **cls.REQUEST_COLUMNS}:
+            table._columns[name] = load_column(name)
+        table._server_offsets = load_column("server_offsets")
+        table._server_indices = load_column("server_indices")
+        table.request_ids = load_column("request_ids").tolist()
+        table._request_rows = {req_id: i for i, req_id in enumerate(table.request_ids)}
+        return table
+
+    def request_row(self, req_id: str):
+        """Finds the row of a JobRequest in the requests table.
+
+        Args:
+            req_id: The JobRequest identifier.
+
+        Returns:
+            int: The row of the JobRequest, -1 if unknown, e.g. for power-offs.
+        """
+        return self._request_rows.get(req_id, -1)
+
+    def add(self, job: Job):
+        """Appends a completed Job to the segments table.
+
+        Args:
+            job: The Job retired by the Scheduler.
+        """
+        row = self.size
+        self._reserve(row + 1, self.SEGMENT_COLUMNS)
+        if row + 2 > len(self._server_offsets):
+            self._server_offsets = self._grow(self._server_offsets, row + 2)
+        columns = self._columns
+        columns["request"][row] = self.request_row(job.id)
+        columns["kind"][row] = SegmentKind.from_job(job)
+        columns["start"][row] = job.start_time
+        columns["end"][row] = job.end_time
+        columns["mass"][row] = job.mass
+        columns["alpha"][row] = job.alpha
+        columns["data"][row] = job.data
+
+        offset = self._server_offsets[row]
+        end_offset = offset + len(job.servers)
+        if end_offset > len(self._server_indices):
+            self._server_indices = self._grow(self._server_indices, end_offset)
+        self._server_indices[offset:end_offset] = [srv.index for srv in job.servers]
+        self._server_offsets[row + 1] = end_offset
+        self.size += 1
+
+    def compact(self):
+        """Releases the rows allocated in advance, once the table is complete.
+
+        Returns:
+            SegmentTable: The SegmentTable object itself.
+        """
+        for name in self.SEGMENT_COLUMNS:
+            self._columns[name] = self._columns[name][: self.size].copy()
+        for name in self.REQUEST_COLUMNS:
+            self._columns[name] = self._columns[name][: self.request_count].copy()
+        self._server_offsets = self.server_offsets.copy()
+        self._server_indices = self.server_indices.copy()
+        return self
+
+    def servers(self, row: int):
+        """Gets the server indices of one segment.
+
+        Args:
+            row: The row of the segment.
+
+        Returns:
+            numpy.array: The indices of the servers of the segment.
+        """
+        offsets = self._server_offsets
+        return self._server_indices[offsets[row] : offsets[row + 1]]
+
+    def energy(self):
+        """Computes the energy consumed by the servers during the segments.
+
+        Returns:
+            The energy in Watt-seconds, rebooting servers included.
+        """
+        duration = self.duration
+        energy = numpy.where(
+            self.kind == SegmentKind.POWER_OFF,
+            Server.Consumption.reboot(duration),
+            Server.Consumption.active(duration),
+        )
+        return float(numpy.dot(energy, self.server_count))
+
+    def area(self):
+        """Computes the sum of the durations of the segments times their servers.
+
+        Returns:
+            The busy area of the schedule in server-seconds.
+        """
+        return float(numpy.dot(self.duration, self.server_count))
+
+    def last_end_times(self):
+        """Finds the ending time of the last segment of each JobRequest.
+
+        Returns:
+            numpy.array: The ending times, by request row, NaN if not started.
+        """
+        rows = numpy.flatnonzero(self.request >= 0)
+        last_rows = numpy.full(self.request_count, -1)
+        numpy.maximum.at(last_rows, self.request[rows], rows)
+        # Requests without any completed segment have no ending time.
+        started = last_rows >= 0
+        end_times = numpy.full(self.request_count, numpy.nan)
+        end_times[started] = self.end[last_rows[started]]
+        return end_times
+
+    def stretch_times(self):
+        """Computes the stretch time of each JobRequest.
+
+        Returns:
+            numpy.array: The stretch times, by request row.
+        """
+        return (self.last_end_times() - self.sub_time) / self.req_mass
+
+    def _reserve(self, rows: int, names):
+        # Grows the named columns until they can hold rows.
+        for name in names:
+            column = self._columns[name]
+            if rows > len(column):
+                self._columns[name] = self._grow(column, rows)
+
+    @staticmethod
+    def _grow(array, min_size):
+        # Doubles the size of the array, at least to min_size.
+        grown = numpy.empty(max(min_size, 2 * len(array)), array.dtype)
+        grown[: len(array)] = array
+        return grown
@@ -65,6 +65,8 @@ class Server:
         BOOT = 151  #: The duration in seconds for booting a server.
         SHUTDOWN = 6  #: The duration in seconds for shuting down a server.
 
+    __slots__ = ("index", "jobs")
+
     def __init__(self, index):
         """Creates a Server object.
 
@@ -73,26 +75,28 @@ class Server:
 
         """
         self.index = index  #: The Server object's identifier.
-        self.jobs = []  #: A List of Jobs assigned to the Server object.
+        self.jobs = {}
+        """A dictionary of the Jobs assigned to the Server object, used as an\
+        insertion ordered set."""
 
     def __repr__(self):
-        return f"Server-{self.index}: {self.jobs}"
+        return f"Server-{self.index}: {list(self.jobs)}"
 
     def add_job(self, job: Job):
-        """Appends a job into the Server object's jobs list.
+        """Adds a job into the Server object's jobs.
 
         Args:
-            job: The Job object to be added to the Server object's jobs list.
+            job: The Job object to be added to the Server object's jobs.
         """
-        self.jobs.append(job)
+        self.jobs[job] = None
 
     def remove_job(self, job: Job):
-        """Removes a job from the Server object's jobs list.
+        """Removes a job from the Server object's jobs in O(1).
 
         Args:
-            job: The Job object to be removed from the Server object' jobs list.
+            job: The Job object to be removed from the Server object' jobs.
         """
-        self.jobs.remove(job)
+        del self.jobs[job]
 
     def is_busy(self, time):
         """Checks whether a Server object is running any Jobs at a time t
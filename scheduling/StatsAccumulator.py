@@ -0,0 +1,140 @@
+from math import inf, nan, sqrt
+
+import numpy
+
+from .Job import Job
+from .SegmentTable import SegmentKind, SegmentTable
+from .Server import Server
+
+
+class StatsAccumulator:
+    """An incremental aggregate of the statistics of the completed jobs.
+
+    Every Job is accounted for once, when the Scheduler retires it, so that the
+    statistics of a schedule never require traversing its whole history.
+    """
+
+    def __init__(self):
+        """Creates an empty StatsAccumulator object.
+        """
+        self.energy = 0
+        """The energy consumed by the servers while running jobs or rebooting."""
+        self.area = 0  #: The sum of the durations of the jobs times their servers.
+        self.reconfig_count = 0  #: The total number of completed reconfigurations.
+        self.power_off_count = 0  #: The total number of completed power-offs.
+        self.start_time = inf  #: The earliest starting time of a completed job.
+        self.end_time = -inf  #: The latest ending time of a completed job.
+        self.last_end_times = {}
+        """A dictionary of the ending time of the last completed job of each \
+        JobRequest identifier."""
+        self.stretch_count = 0  #: The count of JobRequests retired so far.
+        self.min_stretch_time = inf  #: The minimum stretch time of the retired ones.
+        self.max_stretch_time = -inf  #: The maximum stretch time of the retired ones.
+        self.mean_stretch_time = 0  #: The mean stretch time of the retired ones.
+        self._stretch_m2 = 0  #: The sum of the squared deviations to the mean.
+
+    @classmethod
+    def from_segments(cls, segments: SegmentTable):
+        """Computes the statistics of a whole table of segments at once.
+
+        Args:
+            segments: The completed jobs of a schedule.
+
+        Returns:
+            StatsAccumulator: A StatsAccumulator object.
+        """
+        accumulator = cls()
+        if not len(segments):
+            return accumulator
+        accumulator.energy = segments.energy()
+        accumulator.area = segments.area()
+        kind = segments.kind
+        accumulator.reconfig_count = int(
+            numpy.count_nonzero(kind == SegmentKind.RECONFIGURATION)
+        )
+        accumulator.power_off_count = int(
+            numpy.count_nonzero(kind == SegmentKind.POWER_OFF)
+        )
+        accumulator.start_time = float(segments.start.min())
+        accumulator.end_time = float(segments.end.max())
+        accumulator.last_end_times = dict(
+            zip(segments.request_ids, segments.last_end_times().tolist())
+        )
+        return accumulator
+
+    @property
+    def work_duration(self):
+        """float: The span of time between the first and the last completed job."""
+        return self.end_time - self.start_time
+
+    def add(self, job: Job):
+        """Accounts for a completed Job.
+
+        Args:
+            job: The Job retired by the Scheduler.
+        """
+        srv_count = len(job.servers)
+        if job.is_power_off():
+            self.energy += Server.Consumption.reboot(job.duration) * srv_count
+            self.power_off_count += 1
+        else:
+            self.energy += Server.Consumption.active(job.duration) * srv_count
+            self.reconfig_count += job.is_reconfiguration()
+            self.last_end_times[job.id] = job.end_time
+        self.area += job.duration * srv_count
+        self.start_time = min(self.start_time, job.start_time)
+        self.end_time = max(self.end_time, job.end_time)
+
+    def stretch_time(self, job_request):
+        """Computes the stretch time of a completed JobRequest.
+
+        Args:
+            job_request: The JobRequest object whose jobs are all complete.
+
+        Returns:
+            The time spent in the system by the request divided by its mass.
+        """
+        end_time = self.last_end_times[job_request.id]
+        return (end_time - job_request.sub_time) / job_request.mass
+
+    def retire(self, job_request):
+        """Folds the stretch time of a completed JobRequest into running statistics.
+
+        The ending time of the request is forgotten, so that the memory used does
+        not grow with the count of requests.
+
+        Args:
+            job_request: The JobRequest object whose jobs are all complete.
+        """
+        stretch_time = self.stretch_time(job_request)
+        del self.last_end_times[job_request.id]
+        self.stretch_count += 1
+        self.min_stretch_time = min(self.min_stretch_time, stretch_time)
+        self.max_stretch_time = max(self.max_stretch_time, stretch_time)
+        # Welford's online update of the mean and the squared deviations.
+        delta = stretch_time - self.mean_stretch_time
+        self.mean_stretch_time += delta / self.stretch_count
+        self._stretch_m2 += delta * (stretch_time - self.mean_stretch_time)
+
+    @property
+    def stdev_stretch_time(self):
+        """float: The sample standard deviation of the retired stretch times."""
+        if self.stretch_count < 2:
+            return nan
+        return sqrt(self._stretch_m2 / (self.stretch_count - 1))
+
+    def normalized_average_power(self, server_count: int):
+        """Computes the average power normalized by the power of idle servers.
+
+        Args:
+            server_count: The total number of servers in the cluster.
+
+        Returns:
+            The ratio of the consumed energy, including idle times, to the \
+            energy consumed by the same servers staying idle.
+        """
+        work_duration = self.work_duration
+        # adding idle time
+        energy_idle = Server.Consumption.idle(work_duration * server_count - self.area)
+        idle_power = Server.Consumption.idle(work_duration) * server_count
+        return (self.energy + energy_idle) / idle_power
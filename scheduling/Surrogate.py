@@ -0,0 +1,103 @@
+from math import log, pi
+
+import numpy
+import scipy.linalg
+import scipy.spatial.distance
+
+
+class Surrogate:
+    """A Gaussian process regression of the cost of SchedulerConfigs.
+
+    The configurations are scaled to the unit hypercube by the bounds of their
+    fields and the costs are standardized. The kernel is a squared exponential
+    whose length scale is picked among ``LENGTH_SCALES`` by maximizing the
+    marginal likelihood of the observations, refitted lazily after new ones.
+    Only the ``max_samples`` latest observations are kept, which bounds the
+    cubic cost of the fit.
+    """
+
+    LENGTH_SCALES = (0.1, 0.2, 0.5, 1.0)
+    """The candidate length scales of the kernel, in the unit hypercube."""
+
+    def __init__(self, bounds: list, noise=0.1, max_samples=500):
+        """Creates a Surrogate object.
+
+        Args:
+            bounds: The (lower, upper) bounds of each configuration field.
+            noise: The variance of the observation noise, relative to the \
+            variance of the standardized costs.
+            max_samples: The maximum count of observations kept.
+        """
+        lower, upper = numpy.array(bounds, dtype=float).T
+        self.lower = lower  #: The lower bound of each configuration field.
+        self.scale = upper - lower  #: The range of each configuration field.
+        self.noise = noise  #: The relative variance of the observation noise.
+        self.max_samples = max_samples  #: The maximum count of observations kept.
+        self.inputs = numpy.empty((0, len(bounds)))
+        """numpy.array: The scaled observed configurations, by row."""
+        self.costs = numpy.empty(0)  #: numpy.array: The observed costs.
+        self._model = None  #: The fitted model, None if out of date.
+
+    def __len__(self):
+        return len(self.costs)
+
+    def observe(self, positions, costs):
+        """Adds observations.
+
+        Args:
+            positions: The configurations, by row.
+            costs: The cost of each configuration.
+        """
+        inputs = (numpy.asarray(positions, dtype=float) - self.lower) / self.scale
+        self.inputs = numpy.vstack((self.inputs, inputs))[-self.max_samples :]
+        self.costs = numpy.concatenate((self.costs, costs))[-self.max_samples :]
+        self._model = None
+
+    def predict(self, positions):
+        """Predicts the cost of configurations.
+
+        Args:
+            positions: The configurations, by row.
+
+        Returns:
+            tuple: The arrays of the predicted mean and standard deviation of \
+            the cost of each configuration.
+        """
+        if self._model is None:
+            self._model = self._fit()
+        length_scale, factor, weights, offset, spread = self._model
+        inputs = (numpy.asarray(positions, dtype=float) - self.lower) / self.scale
+        cross = self._kernel(inputs, self.inputs, length_scale)
+        mean = cross @ weights
+        solved = scipy.linalg.cho_solve(factor, cross.T)
+        variance = numpy.maximum(1 - numpy.sum(cross * solved.T, axis=1), 0)
+        return offset + spread * mean, spread * numpy.sqrt(variance)
+
+    def _fit(self):
+        # Standardizes the costs and keeps the length scale of greatest
+        # marginal likelihood. Returns the length scale, the Cholesky factor of
+        # the covariance, the weights of the mean and the standardization.
+        offset = self.costs.mean()
+        spread = self.costs.std() or 1.0
+        targets = (self.costs - offset) / spread
+        best = None
+        for length_scale in self.LENGTH_SCALES:
+            covariance = self._kernel(self.inputs, self.inputs, length_scale)
+            covariance[numpy.diag_indices_from(covariance)] += self.noise
+            factor = scipy.linalg.cho_factor(covariance, lower=True)
+            weights = scipy.linalg.cho_solve(factor, targets)
+            likelihood = (
+                -0.5 * targets @ weights
+                - numpy.log(numpy.diag(factor[0])).sum()
+                - 0.5 * len(targets) * log(2 * pi)
+            )
+            if best is None or likelihood > best[0]:
+                best = (likelihood, length_scale, factor, weights)
+        _, length_scale, factor, weights = best
+        return length_scale, factor, weights, offset, spread
+
+    @staticmethod
+    def _kernel(inputs, others, length_scale: float):
+        # The squared exponential covariance between two sets of inputs.
+        distances = scipy.spatial.distance.cdist(inputs, others, "sqeuclidean")
+        return numpy.exp(-0.5 * distances / length_scale ** 2)
@@ -1,12 +1,24 @@
-from dataclasses import dataclass
-from random import seed
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, fields
+from math import inf, nan, sqrt
+from pathlib import Path
+from random import random, seed
 from statistics import mean, stdev
 
+import numpy
+import scipy.stats
 import structlog
 
+from .EvaluationCache import EvaluationCache
 from .Experiments import Experiments
+from .ParetoArchive import ParetoArchive
 from .Particle import Particle
+from .RngState import RngState
 from .Scheduler import SchedulerConfig
+from .Surrogate import Surrogate
+from .SwarmCheckpoint import SwarmCheckpoint
+from .WorkloadCache import WorkloadCache
 
 
 @dataclass
@@ -19,14 +31,27 @@ class EpochCost:
     max: float  #: The maximum calculated cost during the epoch.
     mean: float  #: The mean cost value of the epoch.
     std: float  #: The standard deviation of the calculated costs during the epoch.
+    evaluations: int = 0  #: The count of experiments run during the epoch.
+    skipped: int = 0
+    """The count of experiments skipped by racing, the Particles stopped early \
+    being left out of the epoch's costs."""
+    screened: int = 0
+    """The count of Particles not simulated as predicted not to improve by the \
+    surrogate model, their costs being left out of the epoch's costs."""
 
     @classmethod
-    def from_costs(cls, epoch: int, particles_cost: list):
+    def from_costs(
+        cls, epoch: int, particles_cost: list, evaluations=0, skipped=0, screened=0
+    ):
         """Constructs an EpochCost object from a list of calculated costs.
 
         Args:
             epoch: The epoch identifier.
-            particles_cost: A list of all the calculated costs during the epoch.
+            particles_cost: A list of all the calculated costs during the epoch, \
+            the standard deviation is nan if there is only one.
+            evaluations: The count of experiments run during the epoch.
+            skipped: The count of experiments skipped by racing.
+            screened: The count of Particles not simulated.
 
         Returns:
             EpochCost: An EpochCost object.
@@ -36,7 +61,10 @@ class EpochCost:
             min(particles_cost),
             max(particles_cost),
             mean(particles_cost),
-            stdev(particles_cost),
+            stdev(particles_cost) if len(particles_cost) > 1 else nan,
+            evaluations,
+            skipped,
+            screened,
         )
 
     def to_dict(self):
@@ -52,9 +80,52 @@ class EpochCost:
 
 class Swarm(object):
     """An environment in which a population of Particles evolves.
+
+    The positions, velocities and best known positions of the Particles are
+    the rows of (particles x dimensions) matrices, the dimensions being the
+    fields of SchedulerConfig. The whole population moves in one vectorized
+    step.
     """
 
-    def __init__(self, seed_num: int, num_particles: int, num_srvs: int, num_exp=10):
+    C1 = 2
+    """A scaling factor for the relative position of a Particle in respect to its \
+    best known position."""
+    C2 = 2
+    """A scaling factor for the relative position of a Particle in respect to the \
+    group's best known position."""
+    UPDATE_RATE = 0.1  #: The updating rate of the velocities.
+    BOUNDS = {
+        "reconfig_scale": (0, 1),
+        "reconfig_weight": (0, 1),
+        "alpha_weight": (0, 1),
+        "shutdown_scale": (0, 1),
+        "shutdown_weight": (0, 1),
+        "shutdown_time_short": (260, 100000),
+        "shutdown_time_long": (260, 100000),
+        "shutdown_time_prob": (0, 1),
+    }  #: The bounds of each SchedulerConfig field, enforced by reflection.
+
+    def __init__(
+        self,
+        seed_num: int,
+        num_particles: int,
+        num_srvs: int,
+        num_exp=10,
+        num_workers=1,
+        num_expt_workers=1,
+        legacy_workload=False,
+        workload_cache_dir=None,
+        racing=False,
+        racing_batch=1,
+        racing_confidence=0.95,
+        surrogate=False,
+        surrogate_min_samples=10,
+        surrogate_kappa=1.0,
+        cache_evaluations=False,
+        evaluation_cache_dir=None,
+        pareto_guidance=False,
+        batch=False,
+    ):
         """Creates a Swarm object.
 
         Args:
@@ -62,76 +133,552 @@ class Swarm(object):
             num_particles: The Particles count within the Swarm.
             num_srvs: The total servers count.
             num_exp: The total count of experiments.
+            num_workers: The count of processes evaluating the Particles of an \
+            epoch in parallel. The Particles are evaluated one after another if 1.
+            num_expt_workers: The count of processes running the experiments of \
+            one Particle in parallel, only relevant if num_workers is 1.
+            legacy_workload: A flag for generating the workloads with the \
+            historical per-job seeding.
+            workload_cache_dir: The directory in which the generated workloads \
+            are stored across runs. They are only kept in memory if None, in \
+            which case the processes of num_workers and num_expt_workers, which \
+            receive an empty in-memory tier with each task, generate them again.
+            racing: A flag for stopping the evaluation of a Particle once it is \
+            shown to be worse than the best Particle of the epoch. The Particles \
+            are then evaluated one after another, the experiments of a batch \
+            running in parallel if num_expt_workers is greater than 1.
+            racing_batch: The count of experiments run between two comparisons.
+            racing_confidence: The confidence level of the comparisons.
+            surrogate: A flag for screening the Particles with a Surrogate model \
+            trained on the evaluated configurations. A Particle is only simulated \
+            if the lower bound of its predicted cost is below its best cost.
+            surrogate_min_samples: The count of observations from which the \
+            Particles are screened.
+            surrogate_kappa: The count of predicted standard deviations between \
+            the predicted cost and its lower bound.
+            cache_evaluations: A flag for memoizing the results of the \
+            experiments, so that the Particles reaching the same configuration \
+            are not simulated again on the same seeds. The cache is looked up in \
+            this process, only the missing experiments being sent to the \
+            num_workers processes.
+            evaluation_cache_dir: The directory in which the results of the \
+            experiments are stored across runs, if cache_evaluations is set. They \
+            are only kept in memory if None.
+            pareto_guidance: A flag for attracting each Particle towards a leader \
+            drawn from the ParetoArchive instead of the best Particle of the epoch. \
+            The archive is filled in any case, its configurations being measured \
+            on the seeds of the first epoch, see _update_archive.
+            batch: A flag for simulating the experiments of all the Particles of \
+            an epoch in lockstep with a BatchScheduler, in this process. It is \
+            ignored with racing, whose batches are too small to gain from it. \
+            Epochs of fewer than BatchScheduler.MIN_LANES experiments run them \
+            one by one in this process instead. The statistics do not hold the \
+            segments.
         """
         assert num_particles > 1, "The number of particles must be greater than 1"
         seed(seed_num)
         self.seed = seed_num  #: The Experiments' seed.
+        self.positions = numpy.array(
+            [SchedulerConfig.random().to_list() for _ in range(num_particles)]
+        )
+        """numpy.array: The configuration of each Particle, by row."""
+        self.velocities = numpy.zeros_like(self.positions)
+        """numpy.array: The velocity of each Particle, by row."""
+        self.best_positions = self.positions.copy()
+        """numpy.array: The best known configuration of each Particle, by row."""
+        self.best_costs = numpy.full(num_particles, inf)
+        """numpy.array: The best cost of each Particle."""
         self.population = [
-            Particle(SchedulerConfig.random()) for _ in range(num_particles)
+            Particle(self, i) for i in range(num_particles)
         ]  #: list of Particle objects: A container for the members of the the Swarm.
         self.num_srvs = num_srvs  #: The total servers count.
         self.num_exp = num_exp  #: The total count of experiments.
+        self.num_workers = num_workers
+        """The count of processes evaluating the Particles in parallel."""
         self.best_particle = None
         """Particle: The Particle with lowest cost in the Swarm."""
-        self.experiment = Experiments()  #: Experiments: The experimental environment.
+        self.racing = racing
+        """A flag for stopping the evaluation of the Particles shown to be worse."""
+        self.racing_batch = racing_batch
+        """The count of experiments run between two comparisons."""
+        self.racing_confidence = racing_confidence
+        """The confidence level of the comparisons."""
+        self.surrogate = (
+            Surrogate([self.BOUNDS[field.name] for field in fields(SchedulerConfig)])
+            if surrogate
+            else None
+        )
+        """Surrogate: The model of the cost of the configurations, None if the \
+        Particles are not screened."""
+        self.surrogate_min_samples = surrogate_min_samples
+        """The count of observations from which the Particles are screened."""
+        self.surrogate_kappa = surrogate_kappa
+        """The count of predicted standard deviations below the predicted cost."""
+        self.archive = ParetoArchive()
+        """ParetoArchive: The non-dominated configurations evaluated by the Swarm."""
+        self.pareto_guidance = pareto_guidance
+        """A flag for attracting the Particles towards leaders of the archive."""
+        self.batch = batch and not racing
+        """A flag for simulating the experiments of an epoch in lockstep."""
+        self.experiment = Experiments(
+            num_workers=num_expt_workers if num_workers <= 1 or racing else 1,
+            legacy_workload=legacy_workload,
+            workload_cache=WorkloadCache(directory=workload_cache_dir),
+            evaluation_cache=(
+                EvaluationCache(directory=evaluation_cache_dir)
+                if cache_evaluations
+                else None
+            ),
+            batch=self.batch,
+        )  #: Experiments: The experimental environment.
         self.logger = structlog.getLogger(__name__)  #: The Swarm's logger.
 
-    def run_epochs(self, num_epochs: int, stat_handler):
+    def run_epochs(
+        self, num_epochs: int, stat_handler, checkpoint_path=None, resume=False
+    ):
         """Runs the experiments for the specified number of epochs.
 
         Args:
             num_epochs: The epoch count to be run.
             stat_handler: A method handler for injecting a drawing function \
             (draw_stats).
+            checkpoint_path: The location of the SwarmCheckpoint written after \
+            each epoch, no checkpoint is written if None.
+            resume: A flag for continuing from the checkpoint at \
+            checkpoint_path, if it exists, instead of starting over.
 
         Returns:
             list: A list of EpochCost objects encapsulating all costs resulting \
-            from each epochs runs.
+            from each epochs runs, including the ones restored from the checkpoint.
         """
         epochs_costs = []
-        for i in range(num_epochs):
-            self.logger.info("running epoch", epoch=f"{i+1}/{num_epochs}")
-            epoch_cost = self._run_epoch(i, stat_handler)
-            epochs_costs.append(epoch_cost)
+        if resume and checkpoint_path is not None and Path(checkpoint_path).exists():
+            epochs_costs = self.restore(SwarmCheckpoint.load(checkpoint_path))
+            self.logger.info(
+                "resuming from checkpoint",
+                path=str(checkpoint_path),
+                epoch=f"{len(epochs_costs)}/{num_epochs}",
+            )
+        # The pools of the particles and of the experiments are reused by all
+        # the epochs.
+        with self._executor() as executor, self.experiment:
+            for i in range(len(epochs_costs), num_epochs):
+                self.logger.info("running epoch", epoch=f"{i+1}/{num_epochs}")
+                epoch_cost = self._run_epoch(i, stat_handler, executor)
+                epochs_costs.append(epoch_cost)
+                if checkpoint_path is not None:
+                    self.checkpoint(epochs_costs).save(checkpoint_path)
         return epochs_costs
 
-    def _run_epoch(self, num_epoch: int, stat_handler):
+    def checkpoint(self, epochs_costs: list):
+        """Takes a snapshot of the Swarm between two epochs.
+
+        Args:
+            epochs_costs: The EpochCost objects of the epochs already run.
+
+        Returns:
+            SwarmCheckpoint: The SwarmCheckpoint object.
+        """
+        return SwarmCheckpoint(
+            self.positions.copy(),
+            self.velocities.copy(),
+            self.best_positions.copy(),
+            self.best_costs.copy(),
+            self.best_particle.index,
+            list(epochs_costs),
+            RngState.capture(),
+            self.surrogate,
+            self.archive,
+        )
+
+    def restore(self, checkpoint: SwarmCheckpoint):
+        """Restores the Swarm, and the global random number generators, to a \
+        snapshot taken by checkpoint.
+
+        Args:
+            checkpoint: The SwarmCheckpoint object.
+
+        Returns:
+            list: The EpochCost objects of the epochs already run.
+        """
+        if checkpoint.positions.shape != self.positions.shape:
+            raise ValueError(
+                f"The checkpoint holds {len(checkpoint.positions)} Particles, "
+                f"the Swarm has {len(self.positions)}"
+            )
+        self.positions = checkpoint.positions.copy()
+        self.velocities = checkpoint.velocities.copy()
+        self.best_positions = checkpoint.best_positions.copy()
+        self.best_costs = checkpoint.best_costs.copy()
+        self.best_particle = self.population[checkpoint.best_index]
+        if self.surrogate is not None and checkpoint.surrogate is not None:
+            self.surrogate = checkpoint.surrogate
+        if checkpoint.archive is not None:
+            self.archive = checkpoint.archive
+        checkpoint.rng_state.restore()
+        return list(checkpoint.epochs_costs)
+
+    def _executor(self):
+        # A process pool if the Particles are evaluated in parallel, else a
+        # placeholder context yielding None.
+        if self.num_workers > 1 and not (self.racing or self.batch):
+            return ProcessPoolExecutor(max_workers=self.num_workers)
+        return nullcontext()
+
+    def _run_epoch(self, num_epoch: int, stat_handler, executor=None):
         """Runs the experiments for one epoch.
 
         Args:
             num_epoch: The epoch identifier.
             stat_handler: A method handler for injecting a drawing function \
             (draw_stats).
+            executor: The executor evaluating the Particles in parallel, the \
+            Particles are evaluated one after another if None.
 
         Returns:
             EpochCost: An EpochCost object encapsulating all costs resulting from the each run.
         """
         particles_cost = []
         best_cost = None
-        for i, particle in enumerate(self.population):
-            self.logger.info(
-                "running experiments",
-                particle=f"{i+1}/{len(self.population)}",
-                epoch=num_epoch + 1,
-            )
-            stats = self.experiment.run_expts(
-                particle.config,
-                num_srvs=self.num_srvs,
-                num_expts=self.num_exp,
-                seed_num=num_epoch,
-            )
-
+        evaluation_count = 0
+        evaluated = []
+        particles = self._screen_population()
+        if self.racing:
+            evaluations = self._race_population(num_epoch, particles)
+        else:
+            evaluations = self._evaluate_population(num_epoch, executor, particles)
+        for particle, (stats, rng_state) in zip(particles, evaluations):
+            # Continues from the random state the evaluation left, as if it had
+            # been performed in this process.
+            rng_state.restore()
             if stat_handler is not None:
-                stat_handler(num_epoch, i, stats)
+                stat_handler(num_epoch, particle.index, stats)
+
+            evaluation_count += len(stats)
+            if len(stats) < self.num_exp:
+                # The mean cost of a Particle stopped early by racing covers its
+                # first seeds only, so it is not compared to full evaluations.
+                continue
 
             cost = mean([stat.cost for stat in stats])
             particles_cost.append(cost)
             if best_cost is None or cost < best_cost:
                 best_cost = cost
                 self.best_particle = particle
+            if self.surrogate is not None:
+                self.surrogate.observe(self.positions[[particle.index]], [cost])
+            evaluated.append((particle, stats))
             particle.update_cost(cost)
 
-        for particle in self.population:
-            particle.update_position(self.best_particle.config)
+        self._update_archive(num_epoch, evaluated, executor)
+        self._update_positions(self.best_particle.index)
 
-        return EpochCost.from_costs(num_epoch, particles_cost)
+        return EpochCost.from_costs(
+            num_epoch,
+            particles_cost,
+            evaluations=evaluation_count,
+            skipped=len(particles) * self.num_exp - evaluation_count,
+            screened=len(self.population) - len(particles),
+        )
+
+    def _update_archive(self, num_epoch: int, evaluated: list, executor=None):
+        """Adds the non-dominated configurations of an epoch to the archive.
+
+        The seeds of the experiments change with the epochs, so the objectives
+        of two epochs are not compared: the front of the epoch is found among
+        its own Particles, then the configurations of this front are measured
+        on the seeds of the first epoch, the same for every epoch, before
+        joining the archive. The experiments of the epoch already run on these
+        seeds are reused, the other ones are run with the random state of this
+        process left unchanged.
+
+        Args:
+            num_epoch: The epoch identifier, used as the experiments seed.
+            evaluated: The fully evaluated Particles of the epoch along with \
+            their statistics.
+            executor: The executor running the missing experiments in parallel, \
+            they are run one after another if None.
+        """
+        if not evaluated:
+            return
+        objectives = self.archive.OBJECTIVES
+        front = ParetoArchive.non_dominated(
+            [
+                [mean([getattr(stat, name) for stat in stats]) for name in objectives]
+                for _, stats in evaluated
+            ]
+        )
+        front = [evaluated[i] for i in numpy.flatnonzero(front)]
+
+        # The experiment i of the epoch ran on the seed num_epoch + i.
+        missing_seeds = list(range(min(num_epoch, self.num_exp)))
+        configs = [particle.config for particle, _ in front for _ in missing_seeds]
+        seeds = missing_seeds * len(front)
+        results = []
+        if configs:
+            rng_state = RngState.capture()
+            if self.batch and self.experiment.can_batch():
+                results = self.experiment.run_batch(configs, self.num_srvs, seeds)
+            else:
+                results = self.experiment.run_cached(
+                    configs, self.num_srvs, seeds, executor
+                )
+            rng_state.restore()
+
+        for i, (particle, stats) in enumerate(front):
+            missing_count = len(missing_seeds)
+            missing_results = results[i * missing_count : (i + 1) * missing_count]
+            stats = [stat for stat, _ in missing_results] + stats[
+                : self.num_exp - missing_count
+            ]
+            self.archive.add(
+                self.positions[particle.index],
+                [mean([getattr(stat, name) for stat in stats]) for name in objectives],
+                num_epoch,
+            )
+
+    def _screen_population(self):
+        """Selects the Particles to be simulated.
+
+        Once the Surrogate has enough observations, the Particles whose
+        predicted cost lower bound is not below their best cost are left out,
+        as they are unlikely to improve. The two Particles of lowest bound are
+        always kept.
+
+        Returns:
+            list: The Particles to be simulated, in the order of the population.
+        """
+        if self.surrogate is None or len(self.surrogate) < self.surrogate_min_samples:
+            return self.population
+        predicted, deviation = self.surrogate.predict(self.positions)
+        lower_bounds = predicted - self.surrogate_kappa * deviation
+        promising = lower_bounds < self.best_costs
+        promising[numpy.argsort(lower_bounds, kind="stable")[:2]] = True
+        return [particle for particle in self.population if promising[particle.index]]
+
+    def _update_positions(self, best: int):
+        """Moves every Particle towards its best and the group best positions.
+
+        Two factors are drawn from the random module for each Particle, in the
+        order of the population. With pareto_guidance, the group best position
+        of each Particle is a leader drawn from the archive.
+
+        Args:
+            best: The row of the Particle with the lowest cost of the epoch.
+        """
+        factors = numpy.array([random() for _ in range(2 * len(self.positions))])
+        factors = factors.reshape(-1, 2)
+        if self.pareto_guidance and len(self.archive):
+            leaders = self.archive.select_leaders(len(self.positions))
+            self.velocities, self.positions = self._move(leaders, factors)
+            return
+
+        velocities, positions = self._move(self.positions[best], factors)
+        # The Particles used to move one after another: the ones following the
+        # best Particle were attracted by its new position.
+        following = slice(best + 1, None)
+        velocities[following], positions[following] = self._move(
+            positions[best], factors[following], following
+        )
+        self.velocities = velocities
+        self.positions = positions
+
+    def _move(self, group_best, factors, rows=slice(None)):
+        """Computes the next velocities and positions of Particles.
+
+        Args:
+            group_best: The position attracting the Particles, or the position \
+            attracting each Particle, by row.
+            factors: The two random factors of each Particle, by row.
+            rows: The rows of the Particles to be moved.
+
+        Returns:
+            tuple: The velocities and the positions, within the bounds.
+        """
+        position = self.positions[rows]
+        velocity = self.UPDATE_RATE * (
+            self.velocities[rows]
+            + self.C1 * factors[:, :1] * (self.best_positions[rows] - position)
+            + self.C2 * factors[:, 1:] * (group_best - position)
+        )
+        return velocity, self._reflect(velocity + position)
+
+    def _reflect(self, positions):
+        # Handles boundaries checks through the reflection method.
+        lower, upper = numpy.array(
+            [self.BOUNDS[field.name] for field in fields(SchedulerConfig)]
+        ).T
+        return numpy.where(
+            positions > upper,
+            upper - (positions - upper),
+            numpy.where(positions < lower, lower + (lower - positions), positions),
+        )
+
+    def _evaluate_population(self, num_epoch: int, executor=None, particles=None):
+        """Evaluates the configuration of every Particle of the population.
+
+        Args:
+            num_epoch: The epoch identifier, used as the experiments seed.
+            executor: The executor evaluating the Particles in parallel, the \
+            Particles are evaluated lazily one after another if None.
+            particles: The Particles to be evaluated, the whole population if None.
+
+        Returns:
+            iterator: The statistics of each Particle along with the random state \
+            left by its evaluation, in the order of the Particles.
+        """
+        particles = self.population if particles is None else particles
+        args = (self.num_srvs, self.num_exp, num_epoch)
+        if self.batch and self.experiment.can_batch():
+            return self._evaluate_experiments(num_epoch, particles)
+        if executor is not None and self.experiment.evaluation_cache is not None:
+            return self._evaluate_experiments(num_epoch, particles, executor)
+        if executor is not None:
+            self.logger.info(
+                "running experiments",
+                particles=len(particles),
+                workers=self.num_workers,
+                epoch=num_epoch + 1,
+            )
+            tasks = [
+                (self.experiment, particle.config, *args) for particle in particles
+            ]
+            return executor.map(_evaluate_config, tasks)
+
+        def evaluate_serially():
+            for particle in particles:
+                self.logger.info(
+                    "running experiments",
+                    particle=f"{particle.index+1}/{len(self.population)}",
+                    epoch=num_epoch + 1,
+                )
+                yield _evaluate_config((self.experiment, particle.config, *args))
+
+        return evaluate_serially()
+
+    def _evaluate_experiments(self, num_epoch: int, particles: list, executor=None):
+        """Evaluates the experiments of all the Particles at once.
+
+        The experiments are simulated by Experiments.run_batch if batch is set,
+        else one by one in the executor, the evaluation cache being looked up and filled in
+        this process.
+
+        Args:
+            num_epoch: The epoch identifier, used as the experiments seed.
+            particles: The Particles to be evaluated.
+            executor: The executor running the experiments missing from the \
+            evaluation cache, ignored if batch is set.
+
+        Returns:
+            iterator: The statistics of each Particle along with the random state \
+            left by its evaluation, in the order of the Particles.
+        """
+        configs = [
+            particle.config for particle in particles for _ in range(self.num_exp)
+        ]
+        seeds = [num_epoch + i for _ in particles for i in range(self.num_exp)]
+        if self.batch:
+            self.logger.info(
+                "running experiments in lockstep",
+                particles=len(particles),
+                experiments=len(configs),
+                epoch=num_epoch + 1,
+            )
+            results = self.experiment.run_batch(configs, self.num_srvs, seeds)
+        else:
+            self.logger.info(
+                "running experiments",
+                particles=len(particles),
+                workers=self.num_workers,
+                epoch=num_epoch + 1,
+            )
+            results = self.experiment.run_cached(
+                configs, self.num_srvs, seeds, executor
+            )
+        for first in range(0, len(results), self.num_exp):
+            particle_results = results[first : first + self.num_exp]
+            _, rng_state = particle_results[-1]
+            yield [stats for stats, _ in particle_results], rng_state
+
+    def _race_population(self, num_epoch: int, particles=None):
+        """Evaluates the Particles one after another, stopping the poor ones.
+
+        The experiments of a Particle are run by batches. After each batch, the
+        costs are paired with the costs of the best fully evaluated Particle on
+        the same seeds, and the evaluation stops if a one-sided t-test shows at
+        racing_confidence that the Particle is worse.
+
+        Args:
+            num_epoch: The epoch identifier, used as the experiments seed.
+            particles: The Particles to be evaluated, the whole population if None.
+
+        Returns:
+            iterator: The statistics of the experiments run for each Particle \
+            along with the random state left by its evaluation, in the order of \
+            the Particles.
+        """
+        particles = self.population if particles is None else particles
+        incumbent_costs = None
+        for particle in particles:
+            self.logger.info(
+                "racing experiments",
+                particle=f"{particle.index+1}/{len(self.population)}",
+                epoch=num_epoch + 1,
+            )
+            config = particle.config
+            stats = []
+            for first in range(0, self.num_exp, self.racing_batch):
+                count = min(self.racing_batch, self.num_exp - first)
+                batch_stats, rng_state = _evaluate_config(
+                    (self.experiment, config, self.num_srvs, count, num_epoch + first)
+                )
+                stats.extend(batch_stats)
+                costs = [stat.cost for stat in stats]
+                if incumbent_costs is not None and self._is_worse(
+                    costs, incumbent_costs[: len(costs)]
+                ):
+                    break
+
+            if len(stats) == self.num_exp and (
+                incumbent_costs is None or mean(costs) < mean(incumbent_costs)
+            ):
+                incumbent_costs = costs
+            yield stats, rng_state
+
+    def _is_worse(self, costs: list, incumbent_costs: list):
+        """Tests whether costs are greater than the paired incumbent costs.
+
+        Args:
+            costs: The costs of a Particle.
+            incumbent_costs: The costs of the incumbent on the same seeds.
+
+        Returns:
+            True if the mean difference is positive at racing_confidence, False \
+            otherwise or if there are less than two pairs.
+        """
+        count = len(costs)
+        if count < 2:
+            return False
+        differences = numpy.subtract(costs, incumbent_costs)
+        quantile = scipy.stats.t.ppf(self.racing_confidence, count - 1)
+        margin = quantile * differences.std(ddof=1) / sqrt(count)
+        return differences.mean() - margin > 0
+
+
+def _evaluate_config(task):
+    """Runs the experiments of one Particle.
+
+    Defined at the module level to be picklable by the process pool.
+
+    Args:
+        task: A tuple of the Experiments object, the SchedulerConfig, the servers \
+        count, the experiments count and the seed.
+
+    Returns:
+        tuple: The list of SchedulerStats and the RngState left by the experiments.
+    """
+    experiment, config, num_srvs, num_expts, seed_num = task
+    stats = experiment.run_expts(
+        config, num_srvs=num_srvs, num_expts=num_expts, seed_num=seed_num
+    )
+    return stats, RngState.capture()
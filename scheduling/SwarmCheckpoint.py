@@ -0,0 +1,66 @@
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy
+
+from .RngState import RngState
+
+
+@dataclass
+class SwarmCheckpoint:
+    """A snapshot of a Swarm taken between two epochs.
+
+    Along with the state matrices of the Particles, the checkpoint holds the
+    costs of the epochs already run and the state of the global random number
+    generators, so that a Swarm restored from it continues bit-identically.
+    """
+
+    positions: numpy.ndarray  #: The configuration of each Particle, by row.
+    velocities: numpy.ndarray  #: The velocity of each Particle, by row.
+    best_positions: numpy.ndarray
+    """The best known configuration of each Particle, by row."""
+    best_costs: numpy.ndarray  #: The best cost of each Particle.
+    best_index: int  #: The row of the best Particle of the last epoch.
+    epochs_costs: list  #: The EpochCost objects of the epochs already run.
+    rng_state: RngState  #: The state of the global random number generators.
+    surrogate: object = None  #: The Surrogate model of the Swarm, if any.
+    archive: object = None  #: The ParetoArchive of the Swarm.
+
+    @property
+    def epoch_count(self):
+        """int: The count of epochs already run."""
+        return len(self.epochs_costs)
+
+    def save(self, path):
+        """Writes the checkpoint.
+
+        Directories referenced by path are created similar to mkdir -p. The
+        checkpoint is written to a temporary file then renamed, so that an
+        interrupted write leaves the previous checkpoint intact.
+
+        Args:
+            path: The location of the checkpoint file.
+        """
+        path = Path(path)
+        path.parent.mkdir(0o755, parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path):
+        """Reads a checkpoint written by save.
+
+        Args:
+            path: The location of the checkpoint file.
+
+        Returns:
+            SwarmCheckpoint: The SwarmCheckpoint object.
+        """
+        with open(path, "rb") as file:
+            return pickle.load(file)
@@ -0,0 +1,268 @@
+import heapq
+from collections import OrderedDict
+from itertools import count
+from math import ceil, inf
+
+import pandas
+
+from .JobRequest import JobRequest
+
+
+class TraceReader:
+    """A reader streaming the JobRequests of production workload traces.
+
+    The traces are parsed by chunks of rows and the JobRequests are yielded
+    lazily in submission order, so a trace is replayed without being loaded
+    whole. The traces carry neither the speedup factor nor the data amount of
+    the jobs, all JobRequests share the alpha and data of the reader. The mass
+    of a job is chosen so that it runs during its recorded runtime on its
+    maximum number of servers.
+    """
+
+    SWF_COLUMNS = {
+        0: "job",
+        1: "sub_time",
+        3: "run_time",
+        4: "allocated",
+        7: "requested",
+    }  #: The columns of a Standard Workload Format file read, by position.
+    GOOGLE_COLUMNS = {
+        0: "timestamp",
+        2: "job",
+        3: "task",
+        5: "event",
+        9: "cpu",
+    }  #: The columns of a Google cluster-trace task_events file read, by position.
+    GOOGLE_SUBMIT = 0  #: The Google task event type of a submission.
+    GOOGLE_SCHEDULE = 1  #: The Google task event type of a task placement.
+    GOOGLE_EVICT = 2  #: The Google task event type of a descheduled task.
+    GOOGLE_FINISH = 4  #: The Google task event type of a normal termination.
+    GOOGLE_ENDS = (3, 4, 5, 6)
+    """The Google task event types ending a task: fail, finish, kill and lost."""
+    GOOGLE_TIME_SCALE = 1e-6  #: The duration in seconds of a Google time unit.
+    GOOGLE_END_OF_TRACE = 2 ** 63 - 1
+    """The Google timestamp of the events occurring after the end of the trace."""
+
+    def __init__(
+        self,
+        server_count: int,
+        alpha=0.75,
+        data=255,
+        chunk_size=65536,
+        reorder_window=3600,
+    ):
+        """Creates a TraceReader object.
+
+        Args:
+            server_count: The total number of servers of the simulated cluster, \
+            the jobs are shrunk to fit on it.
+            alpha: The speedup factor alpha of every JobRequest.
+            data: The amount of data of every JobRequest.
+            chunk_size: The number of rows parsed at once.
+            reorder_window: The duration in seconds during which a finished \
+            Google task waits for the tasks submitted before it, see read_google.
+        """
+        self.server_count = server_count  #: The total number of servers.
+        self.alpha = alpha  #: The speedup factor alpha of every JobRequest.
+        self.data = data  #: The amount of data of every JobRequest.
+        self.chunk_size = chunk_size  #: The number of rows parsed at once.
+        self.reorder_window = reorder_window
+        """The duration in seconds during which a finished task waits for the \
+        tasks submitted before it."""
+        self.late_count = 0
+        """The count of Google tasks of the last read whose submission time was \
+        moved forward, as they ended after their reorder window."""
+
+    def read_swf(self, path):
+        """Streams the jobs of a Standard Workload Format file.
+
+        The jobs of a SWF file are sorted by submission time. Jobs without a
+        positive runtime or processor count, e.g. cancelled ones, are skipped.
+
+        Args:
+            path: The path of the SWF file, possibly compressed.
+
+        Yields:
+            JobRequest: The JobRequest objects in submission order.
+
+        Raises:
+            ValueError: If the jobs are not sorted by submission time.
+        """
+        return self._read_swf(path, "job", 0)
+
+    def read_swf_files(self, paths):
+        """Streams the jobs of consecutive Standard Workload Format files.
+
+        The submission times of each file, starting from 0, are shifted by the
+        last submission time of the previous files so that the files follow each
+        other, and the identifiers of the jobs are prefixed with the index of
+        their file, the job numbers restarting in every file.
+
+        Args:
+            paths: The paths of the SWF files, possibly compressed, in time order.
+
+        Yields:
+            JobRequest: The JobRequest objects in submission order.
+
+        Raises:
+            ValueError: If the jobs of a file are not sorted by submission time.
+        """
+        time_offset = 0
+        for index, path in enumerate(paths):
+            job_request = None
+            for job_request in self._read_swf(path, f"job{index}-", time_offset):
+                yield job_request
+            if job_request is not None:
+                time_offset = job_request.sub_time
+
+    def _read_swf(self, path, id_prefix: str, time_offset):
+        # Streams the jobs of a SWF file, with prefixed identifiers and shifted
+        # submission times.
+        last_sub_time = -1
+        for chunk in self._read_chunks(path, self.SWF_COLUMNS, sep=r"\s+", comment=";"):
+            processors = chunk["allocated"].where(
+                chunk["allocated"] > 0, chunk["requested"]
+            )
+            rows = zip(
+                chunk["job"].tolist(),
+                chunk["sub_time"].tolist(),
+                chunk["run_time"].tolist(),
+                processors.tolist(),
+            )
+            for job, sub_time, run_time, processor_count in rows:
+                if run_time <= 0 or processor_count <= 0:
+                    continue
+                if sub_time < last_sub_time:
+                    raise ValueError(
+                        f"The job {job} of {path} is submitted before the previous one."
+                    )
+                last_sub_time = sub_time
+                yield self._make_request(
+                    f"{id_prefix}{job}",
+                    time_offset + sub_time,
+                    run_time,
+                    processor_count,
+                )
+
+    def read_google(self, paths):
+        """Streams the tasks of Google cluster-trace (2011) task_events files.
+
+        A task is yielded once it finishes, with the time elapsed since its
+        last placement as runtime. Tasks failing, killed or lost are skipped.
+        The CPU request of a task, a fraction of the largest machine, is read
+        as a fraction of the simulated cluster.
+
+        A finished task is held back until every task submitted before it has
+        ended, or until the trace reaches reorder_window seconds past its
+        submission, so that tasks running for the whole trace do not hold back
+        all the others. The memory used is thus bounded by the running tasks
+        and the tasks submitted within a window. This is an approximation: a
+        task ending more than reorder_window seconds after its submission may
+        come after later tasks were released, it is then yielded with the
+        submission time of the last released task, and counted in late_count.
+
+        Args:
+            paths: The paths of the task_events files in time order, \
+            possibly compressed.
+
+        Yields:
+            JobRequest: The JobRequest objects in submission order.
+        """
+        if isinstance(paths, (str, bytes)) or not hasattr(paths, "__iter__"):
+            paths = [paths]
+
+        # The submission time, placement time and CPU request of the tasks not
+        # ended yet, in submission order.
+        open_tasks = OrderedDict()
+        # A heap of (submission time, sequence, runtime, CPU request) of the
+        # finished tasks waiting for the tasks submitted before them.
+        finished = []
+        sequence = count()
+        request_count = count()
+        last_sub_time = -inf
+        self.late_count = 0
+
+        def release(watermark):
+            nonlocal last_sub_time
+            while finished and finished[0][0] <= watermark:
+                sub_time, _, run_time, cpu = heapq.heappop(finished)
+                if sub_time < last_sub_time:
+                    # Submitted before a task released when its window passed.
+                    sub_time = last_sub_time
+                    self.late_count += 1
+                last_sub_time = sub_time
+                servers = max(1, ceil(cpu * self.server_count))
+                yield self._make_request(
+                    f"job{next(request_count)}", sub_time, run_time, servers
+                )
+
+        time = -inf
+        for path in paths:
+            for chunk in self._read_chunks(path, self.GOOGLE_COLUMNS, sep=","):
+                rows = zip(
+                    chunk["timestamp"].tolist(),
+                    chunk["job"].tolist(),
+                    chunk["task"].tolist(),
+                    chunk["event"].tolist(),
+                    chunk["cpu"].fillna(0).tolist(),
+                )
+                for timestamp, job, task, event, cpu in rows:
+                    if timestamp == self.GOOGLE_END_OF_TRACE:
+                        continue
+                    time = timestamp * self.GOOGLE_TIME_SCALE
+                    key = (job, task)
+                    if event == self.GOOGLE_SUBMIT:
+                        # Resubmissions keep their original submission time.
+                        task_state = open_tasks.setdefault(key, [time, None, cpu])
+                        task_state[2] = cpu
+                    elif key not in open_tasks:
+                        continue
+                    elif event == self.GOOGLE_SCHEDULE:
+                        open_tasks[key][1] = time
+                    elif event == self.GOOGLE_EVICT:
+                        open_tasks[key][1] = None
+                    elif event in self.GOOGLE_ENDS:
+                        sub_time, start_time, cpu = open_tasks.pop(key)
+                        if event == self.GOOGLE_FINISH and start_time is not None:
+                            run_time = time - start_time
+                            if run_time > 0:
+                                entry = (sub_time, next(sequence), run_time, cpu)
+                                heapq.heappush(finished, entry)
+
+                # No task submitted after the earliest open one may be released,
+                # unless it was submitted more than a window ago.
+                watermark = next(iter(open_tasks.values()))[0] if open_tasks else inf
+                yield from release(max(watermark, time - self.reorder_window))
+
+        # The tasks still running at the end of the trace have no runtime.
+        yield from release(inf)
+
+    def _make_request(self, req_id: str, sub_time, run_time, server_count: int):
+        # Builds a JobRequest lasting run_time on its maximum number of servers.
+        max_num_servers = int(min(server_count, self.server_count))
+        min_num_servers = max(1, ceil((self.alpha / 3) * (max_num_servers - 1)))
+        return JobRequest(
+            req_id,
+            sub_time,
+            self.alpha,
+            self.data,
+            run_time * max_num_servers ** self.alpha,
+            min_num_servers,
+            max_num_servers,
+        )
+
+    def _read_chunks(self, path, columns: dict, **kwargs):
+        # Parses the file by chunks of rows, keeping and naming the columns read.
+        # An empty file, or one holding only comments, has no chunk.
+        try:
+            reader = pandas.read_csv(
+                path,
+                header=None,
+                usecols=list(columns),
+                chunksize=self.chunk_size,
+                **kwargs,
+            )
+        except pandas.errors.EmptyDataError:
+            return
+        for chunk in reader:
+            yield chunk.rename(columns=columns)
@@ -0,0 +1,178 @@
+from enum import IntEnum
+
+import numpy
+import pandas
+import structlog
+
+
+class TraceKind(IntEnum):
+    """The kinds of scheduling events a Tracer records.
+    """
+
+    UPDATE = 0  #: The schedule is updated.
+    SCHEDULE = 1  #: A JobRequest leaves the queue to be run.
+    START = 2  #: A Job starts.
+    REMOVE = 3  #: A Job is retired.
+    RECONFIGURE = 4  #: A Job is reconfigured.
+
+
+class Tracer:
+    """A tracer recording nothing, the default of the Scheduler.
+
+    Call sites check ``enabled`` before building the arguments of ``record``, so
+    a disabled tracer costs one attribute lookup per call site.
+    """
+
+    enabled = False  #: A flag telling the call sites whether to record events.
+
+    @staticmethod
+    def from_option(option):
+        """Creates the Tracer selected by the ``trace`` option of config.yml.
+
+        Args:
+            option: ``log`` for a LogTracer, a count of events for a RingTracer \
+            keeping that many events, nothing is recorded if None.
+
+        Returns:
+            Tracer: The selected Tracer, None if nothing is recorded.
+
+        Raises:
+            ValueError: If the option is neither ``log`` nor a positive count.
+        """
+        if option is None:
+            return None
+        if option == "log":
+            return LogTracer()
+        if isinstance(option, int) and not isinstance(option, bool) and option > 0:
+            return RingTracer(option)
+        raise ValueError(f"Unknown trace option {option!r}, expected log or a count.")
+
+    def record(
+        self,
+        kind: TraceKind,
+        time,
+        request="",
+        server_count=0,
+        active_count=0,
+        queue_length=0,
+    ):
+        """Records a scheduling event.
+
+        Args:
+            kind: The kind of the event.
+            time: The instant of the event.
+            request: The identifier of the JobRequest, empty if none.
+            server_count: The count of servers involved in the event.
+            active_count: The count of active jobs.
+            queue_length: The count of queued JobRequests.
+        """
+
+
+NULL_TRACER = Tracer()  #: The shared Tracer recording nothing.
+
+
+class RingTracer(Tracer):
+    """A tracer recording typed events into a preallocated ring buffer.
+
+    Only the last ``capacity`` events are kept. Recording an event writes one
+    fixed-size row, whatever the number of active jobs. The JobRequest
+    identifiers are truncated to 32 characters.
+    """
+
+    enabled = True
+    DTYPE = numpy.dtype(
+        [
+            ("kind", numpy.int8),
+            ("time", numpy.float64),
+            ("request", "U32"),
+            ("server_count", numpy.int32),
+            ("active_count", numpy.int32),
+            ("queue_length", numpy.int32),
+        ]
+    )  #: The data type of a recorded event.
+
+    def __init__(self, capacity=65536):
+        """Creates a RingTracer object.
+
+        Args:
+            capacity: The maximum count of events kept.
+        """
+        self.buffer = numpy.zeros(capacity, dtype=self.DTYPE)
+        """numpy.array: The ring buffer of recorded events."""
+        self.count = 0  #: The total count of events recorded so far.
+
+    def record(
+        self,
+        kind: TraceKind,
+        time,
+        request="",
+        server_count=0,
+        active_count=0,
+        queue_length=0,
+    ):
+        self.buffer[self.count % len(self.buffer)] = (
+            kind,
+            time,
+            request,
+            server_count,
+            active_count,
+            queue_length,
+        )
+        self.count += 1
+
+    def events(self):
+        """Gets the events kept in the buffer.
+
+        Returns:
+            numpy.array: A structured array of the events, oldest first.
+        """
+        capacity = len(self.buffer)
+        if self.count <= capacity:
+            return self.buffer[: self.count].copy()
+        head = self.count % capacity
+        return numpy.concatenate((self.buffer[head:], self.buffer[:head]))
+
+    def to_frame(self):
+        """Converts the events kept in the buffer into a DataFrame.
+
+        Returns:
+            pandas.DataFrame: One row per event, oldest first, the kinds being \
+            named as in TraceKind.
+        """
+        frame = pandas.DataFrame(self.events())
+        frame["kind"] = [TraceKind(kind).name.lower() for kind in frame["kind"]]
+        return frame
+
+
+class LogTracer(Tracer):
+    """A tracer forwarding the events to a structlog logger at the debug level.
+    """
+
+    enabled = True
+
+    def __init__(self, logger=None):
+        """Creates a LogTracer object.
+
+        Args:
+            logger: The logger receiving the events, the Scheduler's one if None.
+        """
+        self.logger = logger or structlog.getLogger("scheduling.Scheduler")
+        """The logger receiving the events."""
+
+    def record(
+        self,
+        kind: TraceKind,
+        time,
+        request="",
+        server_count=0,
+        active_count=0,
+        queue_length=0,
+    ):
+        self.logger.debug(
+            kind.name.lower(),
+            time=time,
+            request=request,
+            server_count=server_count,
+            active_count=active_count,
+            queue_length=queue_length,
+        )
@@ -1,20 +1,18 @@
+import io
 from dataclasses import astuple, dataclass
 from pathlib import Path
 from random import uniform
 
-import matplotlib.pyplot as plt
+import numpy
 import pandas as pd
 import structlog
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PathCollection
+from matplotlib.figure import Figure
+from matplotlib.path import Path as MplPath
 
 from .Scheduler import SchedulerStats
-
-
-@dataclass
-class Vector2i:
-    """A 2-dimensional vector of int."""
-
-    x: int = 0  #: value on the x axis.
-    y: int = 0  #: value on the y axis.
+from .SegmentTable import SegmentKind, SegmentTable
 
 
 @dataclass
@@ -37,42 +35,116 @@ class Visualizer:
     """A class that creates different types of visualizations.
     """
 
-    def draw_gantt(self, stats: SchedulerStats, filepath: str):
+    RECTANGLE_CODES = [
+        MplPath.MOVETO,
+        MplPath.LINETO,
+        MplPath.LINETO,
+        MplPath.LINETO,
+        MplPath.CLOSEPOLY,
+    ]  #: The path codes of a rectangle outline.
+
+    def draw_gantt(self, stats, filepath: str, colors=None):
         """Draws a Gantt chart.
 
-        Directories referenced by filepath are created similar to mkdir -p.
+        Directories referenced by filepath are created similar to mkdir -p. The
+        chart is drawn off-screen, with a single collection holding the segments
+        of all the jobs. The format follows the extension of filepath: raster
+        (png), vector (svg, pdf) or an HTML page embedding the vector chart (html).
 
         Args:
-            stats (SchedulerStats): A container object for the scheduler's \
-            output statistics.
+            stats: A SchedulerStats object or the SegmentTable of a schedule, \
+            e.g. loaded from a trace written by to_trace.
             filepath (str): The location for writing the resulting Gantt chart.
+            colors: The colors of the segments as returned by gantt_colors, drawn \
+            from the random module if None.
 
         """
+        segments = stats if isinstance(stats, SegmentTable) else stats.segments
         path = Path(filepath)
         path.parent.mkdir(0o755, parents=True, exist_ok=True)
 
-        plt.figure(filepath)
-        plt.subplot()
-
-        power_off_color = Color(0, 0, 0)
-        for jobs in stats.complete_jobs.values():
-            job_color = Color(
-                uniform(0.25, 0.9), uniform(0.25, 0.9), uniform(0.25, 0.9)
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+
+        # One rectangle per segment and server, the rows being expanded from the
+        # server lists of the segments. The rectangles sharing a color are drawn
+        # as one compound path, i.e. one vector element per job.
+        rows = numpy.repeat(numpy.arange(len(segments)), segments.server_count)
+        colors, color_index = self.gantt_colors(segments) if colors is None else colors
+        order = numpy.argsort(color_index[rows], kind="stable")
+        rows = rows[order]
+        left = segments.start[rows]
+        right = segments.end[rows]
+        bottom = segments.server_indices[order].astype(float)
+        top = bottom + 1
+        vertices = numpy.stack(
+            (
+                numpy.stack((left, bottom), axis=-1),
+                numpy.stack((left, top), axis=-1),
+                numpy.stack((right, top), axis=-1),
+                numpy.stack((right, bottom), axis=-1),
+                numpy.stack((left, bottom), axis=-1),
+            ),
+            axis=1,
+        )
+        bounds = numpy.searchsorted(color_index[rows], numpy.arange(1, len(colors)))
+        paths = [
+            MplPath(
+                rectangles.reshape(-1, 2),
+                numpy.tile(self.RECTANGLE_CODES, len(rectangles)),
             )
-            for job in jobs:
-                job_color.a = 0.5 if job.is_reconfiguration() else 1
-                if job.is_power_off():
-                    job_color = power_off_color
-                for server in job.servers:
-                    tl = Vector2i(job.start_time, server.index)
-                    size = Vector2i(job.duration, 1)
-                    self._draw_rectangle(tl=tl, size=size, color=job_color)
-
-        plt.ylabel("servers")
-        plt.xlabel("time")
-        plt.axis("auto")
-        plt.savefig(filepath, dpi=200)
-        plt.close(filepath)
+            for rectangles in numpy.split(vertices, bounds)
+        ]
+        axes.add_collection(
+            PathCollection(paths, facecolors=colors, edgecolors="none", linewidths=0)
+        )
+        axes.autoscale_view()
+
+        axes.set_ylabel("servers")
+        axes.set_xlabel("time")
+        axes.axis("auto")
+        if path.suffix == ".html":
+            svg = io.StringIO()
+            figure.savefig(svg, format="svg")
+            html = f"<!DOCTYPE html>\n<html><body>\n{svg.getvalue()}</body></html>\n"
+            path.write_text(html)
+        else:
+            figure.savefig(path, dpi=200)
+
+    def gantt_colors(self, stats):
+        """Draws the colors of the segments of a Gantt chart.
+
+        Each JobRequest gets a random color, half transparent for its
+        reconfigurations, and the power-offs are black.
+
+        Args:
+            stats: A SchedulerStats object or the SegmentTable of a schedule.
+
+        Returns:
+            tuple: The array of the distinct RGBA colors and the array of the \
+            color index of each segment.
+        """
+        segments = stats if isinstance(stats, SegmentTable) else stats.segments
+        colors = []
+        color_index = numpy.empty(len(segments), int)
+        reconfiguration = segments.kind == SegmentKind.RECONFIGURATION
+        for rows in self._segments_by_request(segments):
+            if segments.request[rows[0]] < 0:
+                # The power-offs are black, but draw as many random numbers as
+                # the jobs, so that the colors of the jobs do not change.
+                job_color = Color(0, 0, 0)
+                for _ in range(3):
+                    uniform(0.25, 0.9)
+            else:
+                job_color = Color(
+                    uniform(0.25, 0.9), uniform(0.25, 0.9), uniform(0.25, 0.9)
+                )
+            color_index[rows] = len(colors) + reconfiguration[rows]
+            colors.append(astuple(job_color))
+            job_color.a = 0.5
+            colors.append(astuple(job_color))
+        return numpy.array(colors).reshape(-1, 4), color_index
 
     def draw_graph(self, stats, filepath: str, show_range=False):
         """Draws a 2D graph of the mean cost against the epoch count.
@@ -88,7 +160,9 @@ class Visualizer:
         """
         path = Path(filepath)
         path.parent.mkdir(0o755, parents=True, exist_ok=True)
-        fig, ax = plt.subplots(1)
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
         if "epoch" in stats:
             # Drawing results of swarm training.
             xlabel = "Epoch"
@@ -110,7 +184,20 @@ class Visualizer:
         ax.legend(loc="upper right")
         ax.set_xlabel(xlabel)
         ax.set_ylabel(ylabel)
-        plt.savefig(filepath, dpi=200)
+        fig.savefig(filepath, dpi=200)
+
+    def to_trace(self, stats: SchedulerStats, path: str):
+        """Writes the schedule of an experiment as a columnar trace.
+
+        The trace can be read back, memory-mapped, with SegmentTable.load.
+
+        Args:
+            stats (SchedulerStats): A container object for the scheduler's \
+            output statistics.
+            path (str): The directory for writing the trace.
+
+        """
+        stats.segments.save(path)
 
     def to_csv(self, table: list, path: str):
         """Converts a list into a csv file.
@@ -130,6 +217,11 @@ class Visualizer:
         )
         df_table.to_csv(path)
 
-    def _draw_rectangle(self, tl, size, color):
-        rectangle = plt.Rectangle((tl.x, tl.y), size.x, size.y, fc=astuple(color))
-        plt.gca().add_patch(rectangle)
+    def _segments_by_request(self, segments: SegmentTable):
+        # The rows of the segments of each request, power-offs being grouped
+        # together, in order of first completion.
+        keys = segments.request
+        unique_keys, first_rows = numpy.unique(keys, return_index=True)
+        rows = numpy.argsort(keys, kind="stable")
+        groups = numpy.split(rows, numpy.searchsorted(keys[rows], unique_keys[1:]))
+        return [groups[i] for i in numpy.argsort(first_rows)]
@@ -0,0 +1,132 @@
+from dataclasses import dataclass, fields
+from math import log, sqrt
+
+import numpy
+
+from .JobRequest import JobRequest
+
+
+@dataclass(frozen=True)
+class Workload:
+    """A compact table of JobRequests, one array per attribute.
+
+    The i-th JobRequest of the table is identified as ``job<i>``.
+    """
+
+    DYNAMISM = 500  #: The scale of the inter-arrival times.
+    MASS = 1700  #: The mean mass of the jobs.
+    DISPARITY = 3.8  #: The disparity of the masses of the jobs.
+
+    sub_time: numpy.ndarray  #: The submission times, in increasing order.
+    alpha: numpy.ndarray  #: The speedup factors alpha.
+    data: numpy.ndarray  #: The amounts of data.
+    mass: numpy.ndarray  #: The amounts of calculations.
+    min_num_servers: numpy.ndarray  #: The minimum required numbers of servers.
+    max_num_servers: numpy.ndarray  #: The maximum required numbers of servers.
+
+    def __len__(self):
+        return len(self.sub_time)
+
+    def freeze(self):
+        """Makes the arrays of the workload read-only.
+
+        Returns:
+            Workload: The Workload object itself.
+        """
+        for array in self.columns().values():
+            array.flags.writeable = False
+        return self
+
+    def columns(self):
+        """Gets the arrays of the workload, without copying them.
+
+        Returns:
+            dict: The arrays of the workload by attribute name.
+        """
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+    @classmethod
+    def generate(
+        cls,
+        job_count: int,
+        server_count: int,
+        seed_num: int,
+        dynamism=DYNAMISM,
+        mass=MASS,
+        disparity=DISPARITY,
+    ):
+        """Generates a workload with a single random number generator.
+
+        All the attributes are drawn at once from the same distributions as\
+        Experiments._generate_job:\n
+        inter-arrival times: Pareto (4, loc=-1) scaled by 3 * dynamism.\n
+        masses: Lognormal of scale mass / disparity.\n
+        alpha: Uniform (0.5, 1).\n
+        data: Uniform (10, 500).\n
+        max_num_servers: Uniform integer in [min_num_servers, server_count).\n
+
+        Args:
+            job_count: The number of jobs to be generated.
+            server_count: The total number of servers.
+            seed_num: The seed of the random number generator.
+            dynamism: The scale of the inter-arrival times.
+            mass: The mean mass of the jobs.
+            disparity: The disparity of the masses of the jobs.
+
+        Returns:
+            Workload: A Workload object.
+        """
+        rng = numpy.random.default_rng(seed_num)
+        # numpy's pareto is the Lomax distribution, i.e. scipy's pareto shifted by -1.
+        arrivals = rng.pareto(4, job_count) * 3 * dynamism
+        mu = log(mass / disparity)
+        sigma = sqrt(2 * (log(mass) - mu))
+        masses = rng.lognormal(mu, sigma, job_count)
+        alpha = rng.uniform(0.5, 1, job_count)
+        data = rng.uniform(10, 500, job_count)
+        min_num_servers = numpy.ceil((alpha / 3) * (server_count - 1)).astype(int)
+        max_num_servers = rng.integers(min_num_servers, server_count)
+        return cls(
+            numpy.cumsum(arrivals),
+            alpha,
+            data,
+            masses,
+            min_num_servers,
+            max_num_servers,
+        )
+
+    @classmethod
+    def from_requests(cls, requests: list):
+        """Builds a Workload from a list of JobRequests.
+
+        Args:
+            requests: A list of JobRequest objects sorted by submission time.
+
+        Returns:
+            Workload: A Workload object.
+        """
+        return cls(
+            numpy.array([req.sub_time for req in requests], dtype=float),
+            numpy.array([req.alpha for req in requests], dtype=float),
+            numpy.array([req.data for req in requests], dtype=float),
+            numpy.array([req.mass for req in requests], dtype=float),
+            numpy.array([req.min_num_servers for req in requests], dtype=int),
+            numpy.array([req.max_num_servers for req in requests], dtype=int),
+        )
+
+    def requests(self):
+        """Iterates over the JobRequests of the workload.
+
+        Yields:
+            JobRequest: The JobRequest objects in submission order.
+        """
+        columns = zip(
+            self.sub_time.tolist(),
+            self.alpha.tolist(),
+            self.data.tolist(),
+            self.mass.tolist(),
+            self.min_num_servers.tolist(),
+            self.max_num_servers.tolist(),
+        )
+        for i, row in enumerate(columns):
+            yield JobRequest("job" + str(i), *row)
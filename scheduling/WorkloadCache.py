@@ -0,0 +1,96 @@
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy
+
+from .Workload import Workload
+
+
+class WorkloadCache:
+    """A memoized store of generated workloads.
+
+    Workloads are kept in a least recently used in-memory tier and, optionally,
+    in an on-disk tier of ``.npz`` files shared by all the processes using the
+    same directory. The stored workloads are read-only.
+
+    The copies sent to worker processes along with their Experiments hold an
+    empty in-memory tier, so that the tasks stay small: in parallel runs, only
+    the on-disk tier shares the workloads between the processes.
+    """
+
+    def __init__(self, max_size=256, directory=None):
+        """Creates a WorkloadCache object.
+
+        Args:
+            max_size: The maximum count of workloads kept in memory.
+            directory: The directory of the on-disk tier, created similar to \
+            mkdir -p. The on-disk tier is disabled if None.
+        """
+        self.max_size = max_size  #: The maximum count of workloads kept in memory.
+        self.directory = None if directory is None else Path(directory)
+        """The directory of the on-disk tier, None if disabled."""
+        self.hits = 0  #: The count of workloads found in the cache.
+        self.misses = 0  #: The count of workloads that had to be generated.
+        self._workloads = OrderedDict()  #: The in-memory tier, in LRU order.
+
+    def __len__(self):
+        return len(self._workloads)
+
+    def __getstate__(self):
+        # Only the settings are sent to worker processes, not the stored workloads.
+        state = self.__dict__.copy()
+        state["_workloads"] = OrderedDict()
+        return state
+
+    def get(self, key: tuple, generate):
+        """Gets a workload, generating it on a cache miss.
+
+        Args:
+            key: A tuple identifying the workload: the seed, servers count, jobs\
+            count and generator parameters.
+            generate: A function without arguments generating the Workload.
+
+        Returns:
+            Workload: The read-only Workload object.
+        """
+        workload = self._workloads.get(key)
+        if workload is not None:
+            self._workloads.move_to_end(key)
+            self.hits += 1
+            return workload
+
+        workload = self._load(key)
+        if workload is None:
+            self.misses += 1
+            workload = generate().freeze()
+            self._save(key, workload)
+        else:
+            self.hits += 1
+
+        self._workloads[key] = workload
+        if len(self._workloads) > self.max_size:
+            self._workloads.popitem(last=False)
+        return workload
+
+    def _path(self, key: tuple):
+        return self.directory / ("workload_" + "_".join(map(str, key)) + ".npz")
+
+    def _load(self, key: tuple):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        with numpy.load(path) as arrays:
+            return Workload(**{name: arrays[name] for name in arrays.files}).freeze()
+
+    def _save(self, key: tuple, workload: Workload):
+        if self.directory is None:
+            return
+        self.directory.mkdir(0o755, parents=True, exist_ok=True)
+        path = self._path(key)
+        # Writes then renames, so that concurrent readers never see partial files.
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        numpy.savez(tmp_path, **workload.columns())
+        os.replace(tmp_path, path)
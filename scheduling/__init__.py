@@ -1,13 +1,19 @@
 import argparse
 import os
+import sys
 
 import pandas as pd
 import structlog
 import yaml
 
-from .ExperimentsTest import run_all_experiments
+from .Benchmark import Benchmark
+from .Experiments import Experiments
+from .ExperimentsTest import load_best_config, run_all_experiments
 from .Logging import init as init_logging
+from .RenderQueue import RenderQueue
 from .Swarm import Swarm
+from .TraceReader import TraceReader
+from .Tracer import RingTracer, Tracer
 from .Visualizer import Visualizer
 
 RESULT_DIR = f"./results/swarm_training/seed_"
@@ -15,13 +21,16 @@ RESULT_DIR = f"./results/swarm_training/seed_"
 logger = structlog.getLogger(__name__)
 
 
-def run_swarm(visualizer: Visualizer, config: dict):
+def run_swarm(visualizer: Visualizer, config: dict, resume=False):
     """Runs the training of the Swarm.
     Args:
-        visualizer: The visualizer object for drawing graphs and charts.
+        visualizer: The visualizer object, or the RenderQueue feeding it, for \
+        drawing graphs and charts.
         config: The loaded configuration of the swarm training.
+        resume: A flag for continuing the training from its last checkpoint.
     """
     seed = config["SEED"]
+    gantt_format = config.get("gantt_format", "png")
 
     def draw_stats(num_epoch, particle_idx, exp_stats):
         """A method to be injected in the run_epochs to draw the stats within the epoch.
@@ -30,11 +39,20 @@ def run_swarm(visualizer: Visualizer, config: dict):
             particle_idx: The particle identifier.
             exp_stats: The list from which the stats are drawn.
         """
+        epoch_dir = f"{RESULT_DIR}{seed}/epoch_{num_epoch}"
         for i, stat in enumerate(exp_stats):
-            visualizer.draw_gantt(
-                stat,
-                f"{RESULT_DIR}{seed}/epoch_{num_epoch}/particule-{particle_idx}-exp-{i}.png",
-            )
+            if stat.segments is None:
+                # Simulated in lockstep, without recording the schedule.
+                continue
+            if config["draw_particle_gantt"]:
+                visualizer.draw_gantt(
+                    stat,
+                    f"{epoch_dir}/particule-{particle_idx}-exp-{i}.{gantt_format}",
+                )
+            if config.get("save_particle_traces"):
+                visualizer.to_trace(
+                    stat, f"{epoch_dir}/particule-{particle_idx}-exp-{i}.trace"
+                )
 
         df_stat = pd.DataFrame([stat.to_dict() for stat in exp_stats])
         logger.debug(f"\n{df_stat}", epoch=num_epoch, particule_idx=particle_idx)
@@ -50,11 +68,35 @@ def run_swarm(visualizer: Visualizer, config: dict):
         num_particles=config["PARTICLE_COUNT"],
         num_srvs=config["SERVER_COUNT"],
         num_exp=config["EXPTS_COUNT"],
+        num_workers=config.get("workers", 1),
+        num_expt_workers=config.get("expt_workers", 1),
+        legacy_workload=config.get("legacy_workload", False),
+        workload_cache_dir=config.get("workload_cache_dir"),
+        racing=config.get("racing", False),
+        racing_batch=config.get("racing_batch", 1),
+        racing_confidence=config.get("racing_confidence", 0.95),
+        surrogate=config.get("surrogate", False),
+        surrogate_min_samples=config.get("surrogate_min_samples", 10),
+        surrogate_kappa=config.get("surrogate_kappa", 1.0),
+        cache_evaluations=config.get("cache_evaluations", False),
+        evaluation_cache_dir=config.get("evaluation_cache_dir"),
+        pareto_guidance=config.get("pareto_guidance", False),
+        batch=config.get("batch", False),
     )
 
-    stat_handler = draw_stats if config["draw_particle_gantt"] else None
+    stat_handler = (
+        draw_stats
+        if config["draw_particle_gantt"] or config.get("save_particle_traces")
+        else None
+    )
+    checkpoint_path = (
+        f"{RESULT_DIR}{seed}/swarm_checkpoint.pkl" if config.get("checkpoint") else None
+    )
     epoch_costs = swarm.run_epochs(
-        num_epochs=config["EPOCH_COUNT"], stat_handler=stat_handler
+        num_epochs=config["EPOCH_COUNT"],
+        stat_handler=stat_handler,
+        checkpoint_path=checkpoint_path,
+        resume=resume,
     )
 
     if config["draw_cost_graph"]:
@@ -65,11 +107,105 @@ def run_swarm(visualizer: Visualizer, config: dict):
         [swarm.best_particle.config.to_dict()],
         f"{RESULT_DIR}{seed}/swarm_best_config.csv",
     )
+    visualizer.to_csv(
+        swarm.archive.to_frame(), f"{RESULT_DIR}{seed}/swarm_pareto_front.csv"
+    )
     visualizer.to_csv(
         [cost.to_dict() for cost in epoch_costs], f"{RESULT_DIR}{seed}/swarm_costs.csv"
     )
 
 
+def replay_trace(visualizer: Visualizer, config: dict, paths: list):
+    """Replays a production workload trace with the best found configuration.
+    Args:
+        visualizer: The visualizer object, or the RenderQueue feeding it, for \
+        writing the statistics.
+        config: The loaded configuration of the trace replay.
+        paths: The paths of the trace files, in time order.
+    """
+    seed = config["SEED"]
+    reader = TraceReader(
+        config["SERVER_COUNT"],
+        alpha=config.get("alpha", 0.75),
+        data=config.get("data", 255),
+        chunk_size=config.get("chunk_size", 65536),
+        reorder_window=config.get("reorder_window", 3600),
+    )
+    if config["format"] == "google":
+        job_requests = reader.read_google(paths)
+    else:
+        job_requests = reader.read_swf_files(paths)
+
+    experiment = Experiments(
+        keep_segments=config.get("keep_segments", False),
+        tracer=Tracer.from_option(config.get("trace")),
+    )
+    stats = experiment.run_trace(
+        load_best_config(seed), config["SERVER_COUNT"], job_requests, seed_num=seed
+    )
+    output_dir = f"./results/trace_replay/seed_{seed}"
+    if stats.segments is not None:
+        visualizer.to_trace(stats, f"{output_dir}/schedule.trace")
+    visualizer.to_csv([stats.to_dict()], f"{output_dir}/trace_replay.csv")
+    if isinstance(experiment.tracer, RingTracer):
+        visualizer.to_csv(
+            experiment.tracer.to_frame(), f"{output_dir}/trace_events.csv"
+        )
+
+
+def run_benchmark_suite(
+    visualizer: Visualizer, config: dict, save_baseline=False, large=False
+):
+    """Times the hot paths of the simulator and compares them to the baseline.
+    Args:
+        visualizer: The visualizer object, or the RenderQueue feeding it, for \
+        writing the measures.
+        config: The loaded configuration of the benchmark suite.
+        save_baseline: A flag for storing the measures as the new baseline \
+        instead of comparing them to it.
+        large: A flag for running the large profile of the configuration, \
+        whose settings replace the default ones.
+    """
+    if large:
+        config = {**config, **config["large"]}
+    benchmark = Benchmark(
+        server_counts=config["server_counts"],
+        job_counts=config["job_counts"],
+        names=config.get("names") or Benchmark.NAMES,
+        repeat=config.get("repeat", 3),
+        max_size=config.get("max_size") or Benchmark.MAX_SIZE,
+    )
+    results = benchmark.run()
+    visualizer.to_csv(
+        [result.to_dict() for result in results], "./results/benchmarks/benchmark.csv"
+    )
+
+    if config.get("validate_batch", True):
+        differences = benchmark.validate_batch()
+        for difference in differences:
+            logger.error(
+                "Lockstep simulation differs from the Scheduler", case=difference
+            )
+        if differences:
+            sys.exit(1)
+        logger.info("Validated the lockstep simulation against the Scheduler")
+
+    baseline = config["baseline"]
+    if save_baseline:
+        Benchmark.save_baseline(results, baseline)
+        logger.info("Saved the benchmark baseline", path=baseline)
+    elif os.path.exists(baseline):
+        regressions = Benchmark.compare(
+            results, baseline, tolerance=config.get("tolerance", Benchmark.TOLERANCE)
+        )
+        for regression in regressions:
+            logger.error("Performance regression", case=regression)
+        if regressions:
+            sys.exit(1)
+    else:
+        logger.warning("No benchmark baseline to compare to", path=baseline)
+
+
 def get_args(args):
     """Parses the input arguments."""
     parser = argparse.ArgumentParser(
@@ -85,6 +221,34 @@ def get_args(args):
         action="store_true",
         help="Initiates the running of six benchmarking experiments.",
     )
+    parser.add_argument(
+        "--replay-trace",
+        nargs="+",
+        metavar="FILE",
+        help="Replays the SWF or Google task_events trace files with the best "
+        "found configuration.",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Times the simulator over a sweep of sizes and fails on regressions "
+        "from the stored baseline.",
+    )
+    parser.add_argument(
+        "--large",
+        action="store_true",
+        help="Runs the large profile of --benchmark, up to millions of jobs.",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Stores the measures of --benchmark as the new baseline.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continues the training of the swarm from its last checkpoint.",
+    )
     args = parser.parse_args(args=args)
     return args
 
@@ -99,11 +263,27 @@ def load_config():
 def main(args):
     init_logging(__name__)
     args = get_args(args)
-    visualizer = Visualizer()
     config = load_config()
+    render_config = config.get("rendering") or {}
+    render_queue = RenderQueue(
+        Visualizer(),
+        num_workers=render_config.get("workers", 0),
+        max_pending=render_config.get("queue_size", 8),
+        drop_late=render_config.get("drop_late", False),
+    )
+
+    # The outputs still being rendered are flushed before exiting.
+    with render_queue as visualizer:
+        if vars(args).get("train_swarm"):
+            run_swarm(visualizer, config["swarm"], resume=args.resume)
 
-    if vars(args).get("train_swarm"):
-        run_swarm(visualizer, config["swarm"])
+        if vars(args).get("run_benchmarks"):
+            run_all_experiments(visualizer, config["benchmarks"])
 
-    if vars(args).get("run_benchmarks"):
-        run_all_experiments(visualizer, config["benchmarks"])
+        if vars(args).get("replay_trace"):
+            replay_trace(visualizer, config["trace_replay"], args.replay_trace)
+
+        if vars(args).get("benchmark"):
+            run_benchmark_suite(
+                visualizer, config["benchmark_suite"], args.save_baseline, args.large
+            )
@@ -0,0 +1,50 @@
+from math import isnan
+from random import getstate
+
+import pytest
+
+from scheduling.BatchScheduler import BatchScheduler
+from scheduling.Experiments import Experiments
+from scheduling.JobRequest import JobRequest
+from scheduling.Scheduler import SchedulerConfig
+from scheduling.Workload import Workload
+
+
+def one_job():
+    return JobRequest("job0", 0, 0.5, 10, 100, 1, 2)
+
+
+@pytest.mark.parametrize("keep_segments", [True, False])
+def test_stats_of_a_single_job(keep_segments):
+    experiment = Experiments(keep_segments=keep_segments)
+    stats = experiment.run_trace(SchedulerConfig(), 2, [one_job()])
+    assert stats.min_stretch_time == stats.max_stretch_time
+    assert stats.mean_stretch_time == stats.min_stretch_time
+    assert isnan(stats.stdev_stretch_time)
+
+
+@pytest.mark.parametrize("keep_segments", [True, False])
+def test_batch_stats_of_a_single_job(keep_segments):
+    scheduler = BatchScheduler(
+        2,
+        [SchedulerConfig()],
+        [Workload.from_requests([one_job()])],
+        [getstate()],
+        keep_segments=keep_segments,
+    )
+    (stats,) = scheduler.run()
+    assert stats.min_stretch_time == stats.max_stretch_time
+    assert isnan(stats.stdev_stretch_time)
+
+
+@pytest.mark.parametrize("crossover", [True, False])
+def test_run_batch_matches_the_scheduler(crossover):
+    experiment = Experiments()
+    configs = [SchedulerConfig.random() for _ in range(3)]
+    seeds = [1, 2, 3]
+    expected = experiment.run_cached(configs, 5, seeds)
+    actual = experiment.run_batch(configs, 5, seeds, crossover=crossover)
+    for (stats, rng_state), (batch_stats, batch_rng_state) in zip(expected, actual):
+        assert batch_stats.to_dict() == stats.to_dict()
+        assert batch_stats.segments is None
+        assert batch_rng_state.python_state == rng_state.python_state
@@ -0,0 +1,18 @@
+from math import isnan
+
+from scheduling.JobRequest import JobRequest
+from scheduling.SegmentTable import SegmentTable
+
+
+def test_last_end_times_without_segments():
+    segments = SegmentTable(2)
+    segments.add_request(JobRequest("job0", 0, 0.5, 10, 100, 1, 2))
+    segments.add_request(JobRequest("job1", 5, 0.5, 10, 100, 1, 2))
+    end_times = segments.last_end_times()
+    assert len(end_times) == 2
+    assert all(isnan(end_time) for end_time in end_times)
+    assert all(isnan(stretch_time) for stretch_time in segments.stretch_times())
+
+
+def test_last_end_times_of_an_empty_table():
+    assert len(SegmentTable(2).last_end_times()) == 0
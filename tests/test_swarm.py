@@ -0,0 +1,47 @@
+from statistics import mean
+
+import numpy
+import pytest
+
+from scheduling.Experiments import Experiments
+from scheduling.ParetoArchive import ParetoArchive
+from scheduling.Scheduler import SchedulerConfig
+from scheduling.Swarm import Swarm
+
+
+def test_non_dominated():
+    objectives = [[1, 4], [2, 2], [2, 3], [4, 1], [2, 2], [5, 5]]
+    front = ParetoArchive.non_dominated(objectives)
+    assert front.tolist() == [True, True, False, True, False, False]
+
+
+@pytest.fixture(scope="module")
+def swarms():
+    swarms = {}
+    for pareto_guidance in (False, True):
+        swarm = Swarm(3, 6, 5, num_exp=10, pareto_guidance=pareto_guidance)
+        swarm.run_epochs(4, None)
+        swarms[pareto_guidance] = swarm
+    return swarms
+
+
+def test_archive_holds_trade_offs(swarms):
+    archive = swarms[False].archive
+    assert len(archive) > 1
+    assert ParetoArchive.non_dominated(archive.objectives).all()
+    assert len(set(archive.epochs.tolist())) > 1
+
+
+def test_archive_is_measured_on_the_same_seeds(swarms):
+    archive = swarms[False].archive
+    experiments = Experiments()
+    for position, objectives in zip(archive.positions, archive.objectives):
+        stats = experiments.run_expts(SchedulerConfig(*position.tolist()), 5, 10, 0)
+        assert objectives.tolist() == [
+            mean([getattr(stat, name) for stat in stats])
+            for name in ParetoArchive.OBJECTIVES
+        ]
+
+
+def test_pareto_guidance_follows_the_front(swarms):
+    assert not numpy.array_equal(swarms[False].positions, swarms[True].positions)
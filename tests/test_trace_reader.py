@@ -0,0 +1,45 @@
+import pytest
+
+from scheduling.Experiments import Experiments
+from scheduling.Scheduler import SchedulerConfig
+from scheduling.TraceReader import TraceReader
+
+
+def write_swf(path, jobs):
+    # One line per (job, submission time, runtime, processors) in SWF columns.
+    path.write_text(
+        "; A SWF header comment\n"
+        + "".join(
+            f"{job} {sub_time} 0 {run_time} {processors} -1 -1 {processors}"
+            " -1 -1 1 -1 -1 -1 -1 -1 -1 -1\n"
+            for job, sub_time, run_time, processors in jobs
+        )
+    )
+    return path
+
+
+@pytest.fixture
+def swf_files(tmp_path):
+    first = write_swf(tmp_path / "first.swf", [(1, 0, 100, 2), (2, 50, 200, 1)])
+    second = write_swf(tmp_path / "second.swf", [(1, 0, 300, 1), (2, 20, 100, 4)])
+    return [first, second]
+
+
+def test_read_swf_files_follow_each_other(swf_files):
+    requests = list(TraceReader(5).read_swf_files(swf_files))
+    assert [req.id for req in requests] == ["job0-1", "job0-2", "job1-1", "job1-2"]
+    assert [req.sub_time for req in requests] == [0, 50, 50, 70]
+
+
+def test_replay_two_swf_files(swf_files):
+    stats = Experiments(keep_segments=True).run_trace(
+        SchedulerConfig(), 5, TraceReader(5).read_swf_files(swf_files)
+    )
+    assert stats.segments.request_count == 4
+    assert stats.start_time == 0
+
+
+def test_read_swf_rejects_unsorted_jobs(tmp_path):
+    path = write_swf(tmp_path / "unsorted.swf", [(1, 10, 100, 2), (2, 5, 100, 1)])
+    with pytest.raises(ValueError):
+        list(TraceReader(5).read_swf_files([path]))
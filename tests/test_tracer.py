@@ -0,0 +1,37 @@
+import pytest
+
+from scheduling.Experiments import Experiments
+from scheduling.Scheduler import SchedulerConfig
+from scheduling.Tracer import LogTracer, RingTracer, TraceKind, Tracer
+
+
+def test_from_option():
+    assert Tracer.from_option(None) is None
+    assert isinstance(Tracer.from_option("log"), LogTracer)
+    tracer = Tracer.from_option(16)
+    assert isinstance(tracer, RingTracer)
+    assert len(tracer.buffer) == 16
+    for option in ("ring", 0, True):
+        with pytest.raises(ValueError):
+            Tracer.from_option(option)
+
+
+@pytest.mark.parametrize("keep_segments", [True, False])
+def test_events_hold_the_job_ids(keep_segments):
+    tracer = RingTracer(4096)
+    experiment = Experiments(tracer=tracer, keep_segments=keep_segments)
+    experiment.run_expts(SchedulerConfig(), 5, 1, 0)
+    events = tracer.events()
+    assert 0 < tracer.count <= len(tracer.buffer)
+    scheduled = events[events["kind"] == TraceKind.SCHEDULE]["request"]
+    assert sorted(scheduled, key=lambda req_id: int(req_id[3:])) == [
+        f"job{i}" for i in range(Experiments.GENERATED_JOBS_COUNT)
+    ]
+    assert set(tracer.to_frame()["kind"]) <= {kind.name.lower() for kind in TraceKind}
+
+
+def test_tracing_runs_the_experiments_in_this_process():
+    tracer = RingTracer()
+    with Experiments(num_workers=2, tracer=tracer) as experiment:
+        experiment.run_expts(SchedulerConfig(), 5, 2, 0)
+    assert tracer.count > 0